@@ -33,7 +33,8 @@ from dbus.mainloop.glib import DBusGMainLoop
 DBusGMainLoop(set_as_default=True)
 
 # ───────────────── Imports ────────────────────────────────────
-import argparse, atexit, json, logging, math, os, platform, random, signal, struct, sys, time
+import argparse, atexit, bisect, contextlib, functools, json, logging, math, os, platform, random, re, signal, struct, sys, threading, time
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from typing import Dict, Optional, Tuple
 
@@ -65,6 +66,8 @@ VERSION = "3.1"
 APPNAME = "outback_venus_v3"
 STATE_DIR = "/data/outback_spc"
 STATE_FILE = os.path.join(STATE_DIR, "state.json")
+_PROC_NAME    = __file__                                  # /Mgmt/ProcessName aller Services
+_PROC_VERSION = "Python " + platform.python_version()     # /Mgmt/ProcessVersion
 
 # ───────────────── Hilfen: DBus Verbindungen ──────────────────
 class SystemBus(dbus.bus.BusConnection):
@@ -90,64 +93,142 @@ def new_system_bus_connection() -> BusConnection:
 def clamp(v: float, lo: float, hi: float) -> float:
     return lo if v < lo else hi if v > hi else v
 
+_TRUE = frozenset(("1","true","t","yes","y","on"))
+
 def str2bool(v):
-    if isinstance(v, bool): return v
-    if v is None: return False
-    return str(v).strip().lower() in ("1","true","t","yes","y","on")
+    return v is True or (v is not None and str(v).strip().lower() in _TRUE)
 
-def read_btaddr(cli_val: Optional[str]) -> str:
-    if cli_val: return cli_val
+@functools.lru_cache(maxsize=None)
+def _default_btaddr() -> str:
+    """Legacy-MAC aus utils.py (optional) – Import höchstens einmal."""
     try:
         import utils  # optional
         return getattr(utils, "OUTBACK_ADDRESS", "00:35:FF:02:95:99")
     except Exception:
         return "00:35:FF:02:95:99"
 
+def read_btaddr(cli_val: Optional[str]) -> str:
+    return cli_val or _default_btaddr()
+
 def now_local_date_str() -> str:
     return time.strftime("%Y-%m-%d", time.localtime())
 
+def next_local_midnight(now: float) -> float:
+    """Epoch der nächsten lokalen Mitternacht (mktime rechnet DST selbst ein)."""
+    lt = time.localtime(now)
+    return time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+
+def atomic_write(path: str, data: bytes):
+    """tmp schreiben + fdatasync, dann os.replace und Verzeichnis fsyncen (Rename überlebt Stromausfall)."""
+    tmp = path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+    try:
+        os.write(fd, data)
+        os.fdatasync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+    dfd = os.open(os.path.dirname(path) or ".", os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        os.fsync(dfd)
+    finally:
+        os.close(dfd)
+
 T0 = time.monotonic()
 
 # ───────────────── Logging (Module/Levels & Dedupe) ──────────
 class RateLimitedHandler(logging.Handler):
-    """Einfache Dedupe/Rate-Limitierung pro (logger, level, msg) innerhalb eines Zeitfensters."""
+    """Einfache Dedupe/Rate-Limitierung pro (logger, level, msg) innerhalb eines Zeitfensters.
+    Schlüssel = (Loggername, Level, Format-String, erstes Argument) – das erste Argument trennt z. B.
+    "DummyService %s" je Service; weitere args (Messwerte) bleiben außen vor. Kein getMessage() vor der Entscheidung, Tabelle als LRU begrenzt.
+    Unterdrückte Duplikate werden gezählt und mit der nächsten erlaubten Zeile als "(+N suppressed …)" gemeldet;
+    endet ein Burst, meldet die nächste beliebige Zeile nach Fensterablauf (bzw. close()) den Rest mit der letzten Unterdrückten."""
+    MAX_KEYS = 4096
+
     def __init__(self, base: logging.Handler, rate_limit_ms: int = 400):
         super().__init__(base.level)
         self.base = base
-        self.rate_limit = rate_limit_ms / 1000.0
-        self._last: Dict[Tuple[int,int,str], float] = {}
+        self.rate_limit_ns = int(rate_limit_ms) * 1_000_000
+        self._last: "OrderedDict[Tuple[str,int,object,object], list]" = OrderedDict()   # key -> [last_ts_ns, suppressed_count, last_suppressed]
+        self._pend: set = set()   # Schlüssel mit offenen Zählern
+        self._flush_at = 0        # vorher keine Prüfung der offenen Zähler (ns)
+
+    @staticmethod
+    def _summary(record: logging.LogRecord, n: int, window_s: float) -> logging.LogRecord:
+        return logging.makeLogRecord(dict(record.__dict__, msg="%s (+%d suppressed in last %.1fs)",
+                                          args=(record.getMessage(), n, window_s)))
+
+    def _flush(self, t: int, force: bool = False) -> None:
+        """Offene Zähler abgelaufener Fenster (force: alle) als Sammelzeile ausgeben."""
+        for key in list(self._pend):
+            entry = self._last.get(key)
+            if entry is None:
+                self._pend.discard(key); continue
+            if force or (t - entry[0]) >= self.rate_limit_ns:
+                self.base.emit(self._summary(entry[2], entry[1], (t - entry[0]) / 1e9))
+                entry[1] = 0; entry[2] = None
+                self._pend.discard(key)
+        self._flush_at = t + self.rate_limit_ns
 
     def emit(self, record: logging.LogRecord) -> None:
-        key = (hash(record.name), record.levelno, record.getMessage())
-        t = time.monotonic()
-        last = self._last.get(key, 0.0)
-        if (t - last) >= self.rate_limit:
-            self._last[key] = t
-            self.base.emit(record)
+        args = record.args
+        key = (record.name, record.levelno, record.msg, args[:1] if args.__class__ is tuple else args)
+        try:
+            hash(key)
+        except TypeError:
+            # nicht-hashbare msg/args (z. B. dict/list) → formatierte Nachricht als Schlüssel
+            key = (record.name, record.levelno, record.getMessage(), None)
+        t = time.monotonic_ns()
+        entry = self._last.get(key)
+        if entry is not None and (t - entry[0]) < self.rate_limit_ns:
+            entry[1] += 1; entry[2] = record
+            self._pend.add(key)
+            return
+        if entry is None:
+            self._last[key] = [t, 0, None]
+        else:
+            suppressed, window_s = entry[1], (t - entry[0]) / 1e9
+            entry[0] = t; entry[1] = 0; entry[2] = None
+            self._last.move_to_end(key)
+            if suppressed:
+                self._pend.discard(key)
+                record = self._summary(record, suppressed, window_s)
+        if len(self._last) > self.MAX_KEYS:
+            old, ev = self._last.popitem(last=False)
+            if ev[1]:
+                self._pend.discard(old); self.base.emit(self._summary(ev[2], ev[1], (t - ev[0]) / 1e9))
+        if self._pend and t >= self._flush_at:
+            self._flush(t)   # vor der aktuellen Zeile, Reihenfolge bleibt chronologisch
+        self.base.emit(record)
+
+    def close(self) -> None:
+        if self._pend:
+            self._flush(time.monotonic_ns(), force=True)
+        super().close()
+
+class TextFormatter(logging.Formatter):
+    """[T+s.mmm] MODUL LEVEL text"""
+    __slots__ = ()
+
+    def format(self, r: logging.LogRecord) -> str:
+        return "".join(("[T+", "%.3f" % (time.monotonic() - T0), "s] ",
+                        r.name[:5].ljust(5), " ", r.levelname.ljust(5), " ", r.getMessage()))
+
+class JsonFormatter(logging.Formatter):
+    """Eine JSON-Zeile pro Record, feste Schlüsselreihenfolge."""
+    __slots__ = ()
+    _SEP = (",", ":")
+
+    def format(self, r: logging.LogRecord) -> str:
+        return json.dumps({"t_plus_s": round(time.monotonic() - T0, 3), "module": r.name,
+                           "level": r.levelname, "msg": r.getMessage()},
+                          separators=self._SEP, ensure_ascii=False)
 
 def setup_logging(fmt: str = "text", debug: bool = False, rate_limit_ms: int = 400):
     root = logging.getLogger()
     root.handlers.clear()
     root.setLevel(logging.DEBUG if debug else logging.INFO)
 
-    class TextFormatter(logging.Formatter):
-        def format(self, r: logging.LogRecord) -> str:
-            ts = time.monotonic() - T0
-            module = (r.name[:5]).ljust(5)
-            level = r.levelname.ljust(5)
-            return f"[T+{ts:0.3f}s] {module} {level} {r.getMessage()}"
-
-    class JsonFormatter(logging.Formatter):
-        def format(self, r: logging.LogRecord) -> str:
-            ts = time.monotonic() - T0
-            obj = {
-                "t_plus_s": round(ts, 3),
-                "module": r.name,
-                "level": r.levelname,
-                "msg": r.getMessage(),
-            }
-            return json.dumps(obj, separators=(",",":"))
-
     stream = logging.StreamHandler(sys.stdout)
     stream.setLevel(logging.DEBUG if debug else logging.INFO)
     stream.setFormatter(TextFormatter() if fmt=="text" else JsonFormatter())
@@ -159,16 +240,43 @@ def setup_logging(fmt: str = "text", debug: bool = False, rate_limit_ms: int = 4
         logging.getLogger(name).setLevel(logging.DEBUG if debug else logging.INFO)
 
 # ───────────────── Persistenz: PV-Forward-Zähler ──────────────
+_DT_TO_KWH = 1.0 / 3.6e6   # W·s → kWh
+
 class PvForwardStore:
-    """PV-Forward Energie (kWh) – Tageszähler (Reset um Mitternacht), Lifetime persistent."""
+    """PV-Forward Energie (kWh) – Tageszähler (Reset um Mitternacht), Lifetime persistent.
+    Jedes Inkrement wird als Zeile an ein Append-Log (state.wal) gehängt; state.json wird nur bei
+    der Kompaktierung (stündlich, WAL > 64 KB, force) im Hintergrund-Thread neu geschrieben.
+    WAL-Zeilen: "<seq>,<ts>,<inc_kwh>" bzw. "<seq>,D,<datum>"; state.json merkt sich "wal_seq"."""
+    COMPACT_INTERVAL_S = 3600.0
+    COMPACT_WAL_BYTES = 64 * 1024
+    _JSON_FMT = ('{"pv_forward_total_kwh":%.6f,"pv_forward_day_kwh":%.6f,'
+                 '"pv_forward_day_date":"%s","wal_seq":%d}')
+
     def __init__(self, path: str = STATE_FILE):
         self.path = path
+        self.wal_path = os.path.splitext(path)[0] + ".wal"
         self.total_kwh = 0.0
         self.day_kwh = 0.0
         self.day_date = now_local_date_str()
-        self._dirty = False
-        self._last_save = 0.0
+        # Tageswechsel-Erkennung: nächste lokale Mitternacht vorberechnen (ein float-Vergleich je Tick)
+        self._day_end = next_local_midnight(time.time())
+        self._seq = 0
+        self._wal_fd: Optional[int] = None
+        self._wal_bytes = 0
+        self._wal_good: Optional[int] = None   # Ende der letzten vollständigen WAL-Zeile (None: nicht gelesen)
+        self._last_compact = time.monotonic()
         self._load()
+        self._replay_wal()
+        self._open_wal()
+
+        # Kompaktierungs-Thread: Single-Slot (_pending), _ev = Kompaktierung angefordert
+        self._lock = threading.Lock()
+        self._ev = threading.Event()
+        self._pending: Optional[Tuple[float,float,str,int]] = None
+        self._stop = False
+        self._worker: Optional[threading.Thread] = None   # erst start() (Bridge) – Konstruktion startet keinen Thread
+        # gespeicherter Stand von einem Vortag → sofort rotieren
+        self._rollover(now_local_date_str())
 
     def _ensure_dir(self):
         try:
@@ -183,49 +291,150 @@ class PvForwardStore:
             self.total_kwh = float(d.get("pv_forward_total_kwh", 0.0))
             self.day_kwh = float(d.get("pv_forward_day_kwh", 0.0))
             self.day_date = str(d.get("pv_forward_day_date", self.day_date))
+            self._seq = int(d.get("wal_seq", 0))
         except Exception:
             pass
 
+    def _replay_wal(self):
+        """WAL-Zeilen nach dem letzten kompaktierten Stand (seq > wal_seq) nachspielen.
+        Nur Zeilen mit abschließendem \n zählen (Rest = Stromausfall, wird in _open_wal abgeschnitten)."""
+        try:
+            with open(self.wal_path, "rb") as f:
+                data = f.read()
+            self._wal_good = data.rfind(b"\n") + 1
+            for line in data[:self._wal_good].decode("ascii", "replace").splitlines():
+                try:
+                    seq_s, a, b = line.split(",", 2)
+                    seq = int(seq_s)
+                    if seq <= self._seq:
+                        continue
+                    if a == "D":
+                        self.day_date = b; self.day_kwh = 0.0
+                    else:
+                        inc = float(b)
+                        self.total_kwh += inc; self.day_kwh += inc
+                    self._seq = seq
+                except ValueError:
+                    continue  # kaputte Zeile überspringen, spätere Inkremente zählen weiter
+        except FileNotFoundError:
+            self._wal_good = 0
+        except Exception as e:
+            logging.getLogger("Core").warning("persist wal replay failed: %s", e)
+
+    def _open_wal(self):
+        self._ensure_dir()
+        try:
+            self._wal_fd = os.open(self.wal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            self._wal_bytes = os.fstat(self._wal_fd).st_size
+            # angerissene letzte Zeile entfernen, sonst klebt die nächste O_APPEND-Zeile daran
+            if self._wal_good is not None and self._wal_bytes > self._wal_good:
+                os.ftruncate(self._wal_fd, self._wal_good); self._wal_bytes = self._wal_good
+            elif self._wal_good is None and self._wal_bytes:
+                with open(self.wal_path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        os.write(self._wal_fd, b"\n"); self._wal_bytes += 1
+        except Exception as e:
+            self._wal_fd = None
+            logging.getLogger("Core").warning("persist wal open failed: %s", e)
+
+    def _append(self, line: str):
+        if self._wal_fd is None:
+            return
+        data = line.encode()
+        try:
+            os.write(self._wal_fd, data)
+            self._wal_bytes += len(data)
+        except Exception as e:
+            logging.getLogger("Core").warning("persist wal append failed: %s", e)
+
     def save_if_needed(self, force: bool=False):
+        """Kompaktierung anstoßen, falls fällig – Schreiben erledigt der Worker."""
         now = time.monotonic()
-        if not force and not self._dirty:
-            return
-        if not force and (now - self._last_save) < 15.0:
+        if not force and self._wal_bytes < self.COMPACT_WAL_BYTES \
+                and (now - self._last_compact) < self.COMPACT_INTERVAL_S:
             return
+        self._last_compact = now
+        with self._lock:
+            self._pending = (self.total_kwh, self.day_kwh, self.day_date, self._seq)
+        self._ev.set()
+
+    def _compact(self, snap: Tuple[float,float,str,int]):
+        total, day, date, seq = snap
         self._ensure_dir()
-        tmp = self.path + ".tmp"
+        # 4 feste Felder → JSON direkt formatieren (date stammt immer aus now_local_date_str)
+        payload = self._JSON_FMT % (total, day, date, seq)
         try:
-            with open(tmp, "w") as f:
-                json.dump({
-                    "pv_forward_total_kwh": round(self.total_kwh, 6),
-                    "pv_forward_day_kwh": round(self.day_kwh, 6),
-                    "pv_forward_day_date": self.day_date
-                }, f)
-            os.replace(tmp, self.path)
-            self._dirty = False
-            self._last_save = now
+            atomic_write(self.path, payload.encode())
         except Exception as e:
             logging.getLogger("Core").warning("persist save failed: %s", e)
+            return
+        # WAL nur leeren, wenn seit dem Snapshot nichts angehängt wurde (sonst nächste Runde;
+        # Doppelzählung verhindert der seq-Filter beim Replay)
+        with self._lock:
+            if self._wal_fd is not None and self._seq == seq:
+                try:
+                    os.ftruncate(self._wal_fd, 0)
+                    self._wal_bytes = 0
+                except Exception as e:
+                    logging.getLogger("Core").warning("persist wal truncate failed: %s", e)
+
+    def _writer_loop(self):
+        while True:
+            self._ev.wait()
+            with self._lock:
+                snap, self._pending = self._pending, None
+                self._ev.clear()
+            if snap is not None:
+                self._compact(snap)
+            if self._stop:
+                return
+
+    def start(self):
+        """Kompaktierungs-Worker starten (idempotent)."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._writer_loop, name="pv-store", daemon=True)
+            self._worker.start()
+
+    def close(self, timeout: float = 2.0):
+        """Letzten Stand sofort kompaktieren und Worker beenden (atexit); ohne Worker synchron."""
+        self.save_if_needed(force=True)
+        self._stop = True
+        self._ev.set()
+        if self._worker is not None:
+            self._worker.join(timeout=timeout)
+        else:
+            self._writer_loop()
+        with self._lock:
+            if self._wal_fd is not None:
+                os.close(self._wal_fd)
+                self._wal_fd = None
 
     def integrate(self, p_w: float, dt_s: float):
-        # Tageswechsel prüfen
-        cur_date = now_local_date_str()
-        if cur_date != self.day_date:
-            self.day_date = cur_date
-            self.day_kwh = 0.0
-            self._dirty = True
-        inc_kwh = (p_w * (dt_s/3600.0)) / 1000.0
+        # Tageswechsel prüfen (strftime nur an der Grenze); > 25 h voraus = Uhr zurückgestellt → neu rechnen
+        now = time.time()
+        if now >= self._day_end or self._day_end - now > 90000.0:
+            self._day_end = next_local_midnight(now)
+            self._rollover(now_local_date_str())
+        inc_kwh = p_w * dt_s * _DT_TO_KWH
         if inc_kwh > 0:
-            self.total_kwh += inc_kwh
-            self.day_kwh += inc_kwh
-            self._dirty = True
+            with self._lock:
+                self.total_kwh += inc_kwh
+                self.day_kwh += inc_kwh
+                self._seq += 1
+                self._append(f"{self._seq},{now:.0f},{inc_kwh!r}\n")
+
+    def _rollover(self, cur_date: str):
+        if cur_date != self.day_date:
+            with self._lock:
+                self.day_date = cur_date
+                self.day_kwh = 0.0
+                self._seq += 1
+                self._append(f"{self._seq},D,{cur_date}\n")
 
     def snapshot(self) -> Tuple[float,float,str]:
         return (self.total_kwh, self.day_kwh, self.day_date)
 
-PV_STORE = PvForwardStore()
-atexit.register(lambda: PV_STORE.save_if_needed(force=True))
-
 # ───────────────── D-Bus Dummy-Service (Dry-Run) ──────────────
 class DummyVeDbusService:
     """Emuliert das API von VeDbusService für --dry-run/CLI-Tests ohne D-Bus."""
@@ -254,6 +463,64 @@ class DummyVeDbusService:
         self._registered = True
         logging.getLogger("Core").info("DummyService registered: %s (%d paths)", self.name, len(self.paths))
 
+    # Batch-API wie VeDbusService (with svc: …) – im Dummy ohne Wirkung
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+def publish_batch(svc):
+    """Kontext für gebündelte Pfad-Updates (ein Signal pro Service und Tick):
+    - velib mit dict_updates(): puffert (Pfad, Wert) und sendet beim Verlassen ein PropertiesChanged a{sv}
+    - velib mit __enter__/__exit__: sammelt die Änderungen zu einem ItemsChanged
+    - ältere velib-Versionen: no-op (Einzelsignale wie bisher)
+    Im with-Block nur über den gelieferten Wert schreiben (with publish_batch(svc) as m: m["/pfad"] = v):
+    bei velib ist das der ServiceContext – direkte svc["/pfad"] = v gingen am Batch vorbei und
+    würden je Pfad signalisieren; dict_updates()/Dummy/ältere velib liefern den Service selbst."""
+    du = getattr(svc, "dict_updates", None)
+    if callable(du):
+        return _BatchOn(svc, du())
+    return svc if hasattr(svc, "__enter__") else contextlib.nullcontext(svc)
+
+class _BatchOn:
+    """Hält einen fremden Batch-Kontext offen und gibt dabei den Service (nicht dessen Kontextwert) zurück."""
+    __slots__ = ("_svc", "_ctx")
+
+    def __init__(self, svc, ctx):
+        self._svc, self._ctx = svc, ctx
+
+    def __enter__(self):
+        self._ctx.__enter__()
+        return self._svc
+
+    def __exit__(self, *exc):
+        return self._ctx.__exit__(*exc)
+
+# Schattenwerte: nur publizieren, wenn sich der Wert (um mehr als eps) geändert hat
+_EPS_W   = 0.5     # W
+_EPS_VA  = 0.01    # V / A / Hz / %
+_EPS_KWH = 0.001   # kWh
+_UNSET = object()
+
+def _pub(set_, cache: Dict[str, object], path: str, value, eps: float = 0.0) -> bool:
+    prev = cache.get(path, _UNSET)
+    if prev is not _UNSET:
+        if prev == value:
+            return False
+        if eps and isinstance(value, float) and isinstance(prev, float) and abs(value - prev) <= eps:
+            return False
+    set_(path, value)
+    cache[path] = value
+    return True
+
+# gettext-Callbacks für add_path (einmalig auf Modulebene statt Closure-Fabrik je Service)
+FMT_W   = lambda _p, v: "%.1f W" % v
+FMT_V   = lambda _p, v: "%.1f V" % v
+FMT_A   = lambda _p, v: "%.1f A" % v
+FMT_HZ  = lambda _p, v: "%.1f Hz" % v
+FMT_PCT = lambda _p, v: "%.1f%%" % v
+
 # ───────────────── Test-Szenarien (konsistent) ────────────────
 # Eingaben (intuitiv): pv_tot, L1, L2, L3, dcV, mode
 # mode: "charge" (pv_rest→batt), "discharge" (0→batt), "balanced" (batt≈0)
@@ -269,13 +536,91 @@ SCENARIOS: Dict[str, Dict[str, float | str]] = {
     "gen":             {"pv":0,    "L1":50,  "L2":0,   "L3":0,   "dcV":26.6, "mode":"discharge"},
 }
 
+# Numba (optional): JIT für die Bilanz-Arithmetik des Testmodus; ohne Numba reines Python
+try:
+    from numba import njit  # type: ignore
+except Exception:
+    def njit(*_args, **_kwargs):
+        return lambda f: f
+
+MODE_CHARGE, MODE_DISCHARGE, MODE_BALANCED = 0, 1, 2
+_MODE_CODES = {"charge": MODE_CHARGE, "discharge": MODE_DISCHARGE, "balanced": MODE_BALANCED}
+
+@dataclass(frozen=True)
+class Scenario:
+    """Typisierte, beim Import vorberechnete Testszenario-Zeile (mode als int-Code)."""
+    __slots__ = ("pv", "L1", "L2", "L3", "dcV", "mode")
+    pv: float
+    L1: float
+    L2: float
+    L3: float
+    dcV: float
+    mode: int
+
+SCENARIOS_T: Dict[str, Scenario] = {
+    k: Scenario(float(v["pv"]), float(v["L1"]), float(v["L2"]), float(v["L3"]), float(v["dcV"]),
+                _MODE_CODES.get(str(v["mode"]), MODE_BALANCED))
+    for k, v in SCENARIOS.items()
+}
+
+@njit(cache=True, fastmath=True)
+def _balance(pv, L1, L2, L3, dcV, mode, t, r_pv, r_l1, r_l2, r_l3):
+    """Konsistente Testbilanz → (pv, L1, dcI). t = time/7, r_* = Zufallsphasen je Größe."""
+    # leichte Variation
+    pv = max(0.0, pv*(1.0 + 0.05*math.sin(t + r_pv))); L1 = max(0.0, L1*(1.0 + 0.02*math.sin(t + r_l1)))
+    L2 = max(0.0, L2*(1.0 + 0.02*math.sin(t + r_l2))); L3 = max(0.0, L3*(1.0 + 0.02*math.sin(t + r_l3)))
+
+    # PV→L1
+    pv_to_L1 = min(L1, pv)
+    batt_to_L1 = max(0.0, L1 - pv_to_L1)
+    batt_to_L23 = L2 + L3
+    batt_to_AC = batt_to_L1 + batt_to_L23
+    pv_rest = max(0.0, pv - pv_to_L1)
+
+    if mode == MODE_CHARGE:
+        pv_to_batt = pv_rest
+    elif mode == MODE_DISCHARGE:
+        pv_to_batt = 0.0
+    else:  # balanced
+        pv_to_batt = min(batt_to_AC, pv_rest)
+
+    dcP = pv_to_batt - batt_to_AC                           # + = lädt, - = entlädt
+    dcI = dcP / dcV if dcV else 0.0
+    return pv, L1, dcI
+
 # ───────────────── OutbackReader (Round Snapshot) ─────────────
+@dataclass(frozen=True)
+class ReaderSnap:
+    """Unveränderlicher Messwert-Satz einer Runde; der Reader tauscht nur die Referenz (lock-frei für den Tick)."""
+    __slots__ = ("acP_active", "acV", "acF", "dcV", "dcI", "last_status", "ok")
+    acP_active: float
+    acV: float
+    acF: float
+    dcV: float
+    dcI: float
+    last_status: str
+    ok: bool
+
+# Live-Pfad: nur genutzte Felder dekodieren (Pad-Bytes überspringen, kein Voll-Tupel je Runde).
+# Formate beim Import kompiliert, unpack_from gebunden → je Runde kein Format-Parsing, keine Attributsuche.
+_A03_UNPACK = struct.Struct('<4x5H2x2H').unpack_from   # A03[2..6]=acV,acF,S,P,Load%  [8]=dcV [9]=dcI
+_A11_UNPACK = struct.Struct('<12x2H').unpack_from      # A11[6]=pvV [7]=pvP
+
+
 class OutbackReader:
     """
     Liest Outback-SPC-III Messwerte via BLE oder liefert konsistente Testdaten.
     Round-Modell: A03 + A11 werden pro Runde erfasst (min. Intervall, Backoff).
     """
 
+    # feste Attributliste wie BleOutbackClient: kein Instanz-__dict__, Slot-Zugriff im Rundenpfad
+    __slots__ = ("log", "hci", "mac", "test", "scene", "debug", "_dbg", "min_interval_s", "backoff_max", "_bo", "_fast_conn",
+                 "_p", "_c03", "_c11", "_rd", "_hc", "_hc_ok",
+                 "_busy", "_next_round_at", "_last_snapshot_at", "_consec_fails", "_round_id", "_jidx", "_last_throttle_log",
+                 "_ok_count", "_fail_count", "_acc_read_ms", "_acc_skew_ms", "_last_metrics_ts",
+                 "pvP", "pvV", "pvI", "acV", "acF", "acP_active", "acS_apparent", "loadPct", "dcV", "dcI",
+                 "last_status", "snapshot", "_rand")
+
     # GATT UUIDs (als Platzhalter – wie v3)
     _SRV_1810 = '00001810-0000-1000-8000-00805f9b34fb'  # enthält A03
     _SRV_1811 = '00001811-0000-1000-8000-00805f9b34fb'  # enthält A11
@@ -285,22 +630,39 @@ class OutbackReader:
     BASE_MIN_INTERVAL    = 1.8
     BACKOFF_MAX_DEFAULT  = 15.0
     BACKOFF_MAX          = BACKOFF_MAX_DEFAULT
+    _LADDER              = (1.0, 2.0, 4.0, 8.0, 12.0)   # Backoff-Leiter s (nach consec_fails)
+    # kosmetischer Jitter 0..0.2 s: feste, durchmischte Tabelle statt Zufallszahl je Runde
+    _JITTER              = tuple(((i * 167) & 255) * (0.2/256) for i in range(256))
+
+    # LE-Connection-Interval (×1.25 ms): dominiert die Read-Latenz; OUTBACK_BLE_FAST_INTERVAL=0 → Kernel-Default
+    CONN_MIN_UNITS       = 8     # 10 ms
+    CONN_MAX_UNITS       = 9     # 11.25 ms
+    _DEBUGFS             = "/sys/kernel/debug/bluetooth/%s/%s"
 
     # Eigenverbrauch des Outback (AC-Seite) – nur nachts relevant
     SELF_CONS_W          = 35.0
 
+    # "harte" BTLE-Fehler → sofortiger Reconnect (ein Regex-Durchlauf statt drei Substring-Scans)
+    _HARD_ERR_RE = re.compile(r"(?:Helper not started|Not connected|Device disconnected)")
+
     def __init__(self, hci: str, mac: str, *,
                  test: bool=False, scene: str="day_charge", debug: bool=False,
                  min_interval_s: float=1.8, backoff_max_s: float=15.0, seed: Optional[int]=None):
         self.log = logging.getLogger("Outbk")
         self.hci, self.mac = hci, mac
         self.test, self.scene, self.debug = bool(test), scene, bool(debug)
+        self.refresh_log_gate()
 
         self.min_interval_s = float(min_interval_s or self.BASE_MIN_INTERVAL)
         self.backoff_max    = float(backoff_max_s  or self.BACKOFF_MAX_DEFAULT)
+        self._bo = tuple(min(v, self.backoff_max) for v in self._LADDER)   # Leiter bereits auf backoff_max geklemmt
+
+        self._fast_conn = str2bool(os.environ.get("OUTBACK_BLE_FAST_INTERVAL", "1"))   # einmalig vor dem 1. Connect
 
         # BLE Handles
         self._p = None; self._c03 = None; self._c11 = None
+        self._rd = None                  # gebundenes readCharacteristic der aktuellen Verbindung
+        self._hc = None; self._hc_ok = False   # Value-Handles (A03, A11) über Reconnects; je Verbindung bestätigt
 
         # Round/Timing
         self._busy = False
@@ -308,6 +670,7 @@ class OutbackReader:
         self._last_snapshot_at = 0.0
         self._consec_fails = 0
         self._round_id = 0
+        self._jidx = 0
         self._last_throttle_log = 0.0
 
         # Metriken
@@ -320,9 +683,11 @@ class OutbackReader:
         self.acV = 230.0; self.acF = 50.0
         self.acP_active = 0.0; self.acS_apparent = 0.0; self.loadPct = 0.0
         self.dcV = 26.6; self.dcI = 0.0
+        self.last_status = "init"
+        self._publish(False)
 
-        if seed is not None:
-            random.seed(seed)
+        # eigener Generator wie TestMode: kein geteilter Modul-RNG, globaler Seed bleibt unberührt
+        self._rand = random.Random(seed)
 
         if self.test:
             self._schedule_next(success=True)
@@ -331,7 +696,7 @@ class OutbackReader:
                 self._connect()
                 self._schedule_next(success=True)
             except Exception as e:
-                if self.debug: self.log.debug("First connect failed: %s", e)
+                if self._dbg: self.log.debug("First connect failed: %s", e)
                 self._schedule_next(success=False)
 
     # ─── BLE Connect/Disconnect ───
@@ -339,27 +704,55 @@ class OutbackReader:
         if Peripheral is None:
             raise RuntimeError("bluepy nicht verfügbar")
         iface = int(self.hci[3:]) if self.hci.startswith("hci") else 0
+        if self._fast_conn: self._tune_conn_interval()
         self._p = Peripheral(self.mac, iface=iface)
-        s10 = self._p.getServiceByUUID(self._SRV_1810)
-        s11 = self._p.getServiceByUUID(self._SRV_1811)
-        self._c03 = s10.getCharacteristics(self._A03)[0]
-        self._c11 = s11.getCharacteristics(self._A11)[0]
+        if self._hc is None:
+            # GATT-Discovery nur einmal; danach Handle-Reads ohne Service-/Characteristic-Roundtrips
+            s10 = self._p.getServiceByUUID(self._SRV_1810)
+            s11 = self._p.getServiceByUUID(self._SRV_1811)
+            self._c03 = s10.getCharacteristics(self._A03)[0]
+            self._c11 = s11.getCharacteristics(self._A11)[0]
+            self._hc = (self._c03.getHandle(), self._c11.getHandle()); self._hc_ok = True
+        else:
+            self._hc_ok = False   # gecachte Handles: Prüfung erst bei Fehlschlag (read)
+        self._rd = self._p.readCharacteristic
         self._consec_fails = 0
-        if self.debug: self.log.debug("BLE connected %s on %s", self.mac, self.hci)
+        if self._dbg: self.log.debug("BLE connected %s on %s", self.mac, self.hci)
 
     def _disconnect(self):
-        try:
-            if self._p: self._p.disconnect()
-        except Exception:
-            pass
-        self._p = self._c03 = self._c11 = None
-        if self.debug: self.log.debug("BLE disconnected")
+        if self._p:
+            try:
+                self._p.disconnect()
+            except (BTLEException, OSError, ValueError):   # Helper/Pipe bereits weg
+                pass
+        self._p = self._c03 = self._c11 = self._rd = None
+        if self._dbg: self.log.debug("BLE disconnected")
+
+    def refresh_log_gate(self):
+        """Debug-Gate (Flag + Logger-Level) einmal bestimmen; Levels stehen nach setup_logging fest."""
+        self._dbg = self.debug and self.log.isEnabledFor(logging.DEBUG)
+
+    def _tune_conn_interval(self):
+        """Kurzes Connection-Interval per debugfs für neue Verbindungen (min vor max; ohne root still ignoriert)."""
+        self._fast_conn = False
+        for node, val in (("conn_min_interval", self.CONN_MIN_UNITS), ("conn_max_interval", self.CONN_MAX_UNITS)):
+            try:
+                with open(self._DEBUGFS % (self.hci, node), "w") as f:
+                    f.write(str(val))
+            except Exception as e:
+                if self._dbg: self.log.debug("BLE %s=%d not set (%s)", node, val, e)
+                return
+        if self._dbg: self.log.debug("BLE conn interval %d..%d (x1.25ms)", self.CONN_MIN_UNITS, self.CONN_MAX_UNITS)
+
+    def _drop_handle_cache(self):
+        """Handles verwerfen, wenn sie auf dieser Verbindung noch keine gültige Runde lieferten."""
+        if self._hc and not self._hc_ok and self._p:
+            if self._dbg: self.log.debug("BLE handle cache %s invalid → rediscover", self._hc)
+            self._hc = None; self._disconnect()
 
     # ─── Utils ───
-    @staticmethod
-    def _swap_decode(buf: bytes) -> tuple[int, ...]:
-        shorts = struct.unpack('>' + 'h' * (len(buf)//2), buf)
-        return tuple(((v >> 8) & 255) | ((v & 255) << 8) for v in shorts)
+    def _publish(self, ok: bool):
+        self.snapshot = ReaderSnap(self.acP_active, self.acV, self.acF, self.dcV, self.dcI, self.last_status, ok)
 
     def _schedule_next(self, *, success: bool):
         now = time.time()
@@ -367,11 +760,10 @@ class OutbackReader:
             delay = self.min_interval_s
             self._consec_fails = 0
         else:
-            ladder = [1.0, 2.0, 4.0, 8.0, 12.0]
-            idx = min(max(self._consec_fails-1, 0), len(ladder)-1)
-            delay = min(ladder[idx], self.backoff_max)
-        delay += random.uniform(0.0, 0.2)
-        self._next_round_at = now + delay
+            bo = self._bo
+            delay = bo[min(max(self._consec_fails-1, 0), len(bo)-1)]
+        self._jidx = j = (self._jidx + 1) & 255
+        self._next_round_at = now + delay + self._JITTER[j]
 
     def _report_metrics(self):
         now = time.time()
@@ -379,6 +771,7 @@ class OutbackReader:
             return
         self._last_metrics_ts = now
         avg_read = self._acc_read_ms/self._ok_count if self._ok_count else 0.0
+        # skew = Dauer des zweiten Reads: bluepy blockiert je Read → ≥ 1 Connection-Interval (Backend-abhängig)
         avg_skew = self._acc_skew_ms/self._ok_count if self._ok_count else 0.0
         interval = max(0.0, self._next_round_at - now)
         self.log.info("BLE stats: ok=%d fail=%d avg_read=%.1fms avg_skew=%.1fms interval=%.2fs",
@@ -386,31 +779,13 @@ class OutbackReader:
 
     # ─── Testdaten: konsistente Bilanz ───
     def _gen_consistent(self):
-        base = SCENARIOS.get(self.scene, SCENARIOS["day_charge"])
-        pv = float(base["pv"]); L1=float(base["L1"]); L2=float(base["L2"]); L3=float(base["L3"])
-        dcV = float(base["dcV"]); mode=str(base["mode"])
-
-        # leichte Variation
-        jitter = lambda v,p=0.05: v*(1+p*math.sin(time.time()/7+random.random()))
-        pv = max(0.0, jitter(pv)); L1 = max(0.0, jitter(L1,0.02))
-        L2 = max(0.0, jitter(L2,0.02)); L3 = max(0.0, jitter(L3,0.02))
-
-        # PV→L1
-        pv_to_L1 = min(L1, pv)
-        batt_to_L1 = max(0.0, L1 - pv_to_L1)
-        batt_to_L23 = L2 + L3
-        batt_to_AC = batt_to_L1 + batt_to_L23
-        pv_rest = max(0.0, pv - pv_to_L1)
-
-        if mode == "charge":
-            pv_to_batt = pv_rest
-        elif mode == "discharge":
-            pv_to_batt = 0.0
-        else:  # balanced
-            pv_to_batt = min(batt_to_AC, pv_rest)
-
-        dcP = pv_to_batt - batt_to_AC                       # + = lädt, - = entlädt
-        dcI = dcP / dcV if dcV else 0.0
+        sc = SCENARIOS_T.get(self.scene) or SCENARIOS_T["day_charge"]
+        dcV = sc.dcV
+
+        # leichte Variation (Zufall bleibt in Python; Arithmetik in _balance)
+        t = time.time()/7
+        r = self._rand.random
+        pv, L1, dcI = _balance(sc.pv, sc.L1, sc.L2, sc.L3, dcV, sc.mode, t, r(), r(), r(), r())
 
         # Werte auf Reader-Felder mappen
         self.pvP = pv
@@ -429,7 +804,7 @@ class OutbackReader:
         if self.test:
             if now < self._next_round_at:
                 self.last_status = "throttle"
-                if self.debug and (now - self._last_throttle_log > 5.0):
+                if self._dbg and (now - self._last_throttle_log > 5.0):
                     self.log.debug("throttle until %.3f (in %.1fs)", self._next_round_at, self._next_round_at - now)
                     self._last_throttle_log = now
                 self._report_metrics()
@@ -440,6 +815,7 @@ class OutbackReader:
             self._acc_read_ms += 120.0; self._acc_skew_ms += 10.0
             self._schedule_next(success=True)
             self.last_status = "ok-test"
+            self._publish(True)
             self._report_metrics()
             return True
 
@@ -448,7 +824,7 @@ class OutbackReader:
             self.last_status = "busy"; return True
         if now < self._next_round_at:
             self.last_status = "throttle"
-            if self.debug and (now - self._last_throttle_log > 5.0):
+            if self._dbg and (now - self._last_throttle_log > 5.0):
                 self.log.debug("throttle until %.3f (in %.1fs)", self._next_round_at, self._next_round_at - now)
                 self._last_throttle_log = now
             self._report_metrics()
@@ -457,45 +833,49 @@ class OutbackReader:
         self._busy = True; self._round_id += 1; rid = self._round_id
         try:
             if not self._p: self._connect()
-            t0 = time.monotonic(); raw_a03 = self._c03.read(); t_mid = time.monotonic(); raw_a11 = self._c11.read(); t1 = time.monotonic()
-            a03 = self._swap_decode(raw_a03); a11 = self._swap_decode(raw_a11)
-
-            self.acV = a03[2]*0.1; self.acF = a03[3]*0.1
-            self.acS_apparent = float(a03[4]); self.acP_active = float(a03[5]); self.loadPct = float(a03[6])
-            self.dcV = a03[8]*0.01; self.dcI = float(a03[9])
-            self.pvV = a11[6]*0.1; self.pvP = float(a11[7]); self.pvI = (self.pvP/self.pvV) if self.pvV else 0.0
-
-            self._ok_count += 1
+            rd = self._rd; h03, h11 = self._hc
+            t0 = time.monotonic(); raw_a03 = rd(h03); t_mid = time.monotonic(); raw_a11 = rd(h11); t1 = time.monotonic()
+            acV, acF, self.acS_apparent, self.acP_active, self.loadPct, dcV, dcI = _A03_UNPACK(raw_a03)
+            pvV, pvP = _A11_UNPACK(raw_a11)
+
+            # ints direkt übernehmen – Promotion zu float erfolgt in der Folgearithmetik;
+            # dcI/pvP gehen unverändert auf D-Bus → float, damit der Variant-Typ double bleibt
+            self.acV = acV*0.1; self.acF = acF*0.1
+            self.dcV = dcV*0.01; self.dcI = float(dcI); self.pvP = float(pvP)
+            self.pvV = pvV*0.1; self.pvI = (self.pvP/self.pvV) if self.pvV else 0.0
+
+            self._ok_count += 1; self._hc_ok = True
             self._acc_read_ms += (t1-t0)*1000.0; self._acc_skew_ms += (t1-t_mid)*1000.0
             self._last_snapshot_at = time.time()
             self._schedule_next(success=True)
             self.last_status = "ok"
-            if self.debug:
+            self._publish(True)
+            if self._dbg:
                 self.log.debug("ROUND %d OK | acV=%.1f P_L1=%.0f pv=%.0f dcV=%.2f dcI=%.2f", rid, self.acV, self.acP_active, self.pvP, self.dcV, self.dcI)
             self._report_metrics()
             return True
 
         except BTLEException as e:
-            hard = any(s in str(e) for s in ("Helper not started","Not connected","Device disconnected"))
-            if self.debug: self.log.debug("BLE round %d failed: %s (hard=%s)", rid, e, hard)
+            hard = self._HARD_ERR_RE.search(str(e)) is not None
+            if self._dbg: self.log.debug("BLE round %d failed: %s (hard=%s)", rid, e, hard)
             self._fail_count += 1; self._consec_fails += 1
+            if not hard: self._drop_handle_cache()
+            # Reconnect nicht hier (Sleep + Connect in der Fehlerrunde), sondern lazy zu Beginn der nächsten Runde:
+            # Connect + beide Reads laufen dann als ein Durchgang
             if hard:
-                self._disconnect(); time.sleep(0.2)
-                try: self._connect()
-                except Exception: pass
+                self._disconnect()
                 self._next_round_at = time.time() + 1.5
             else:
                 if self._consec_fails >= 2:
                     self._disconnect()
-                    try: self._connect()
-                    except Exception: pass
                 self._schedule_next(success=False)
-            self.last_status = "exc"; return False
+            self.last_status = "exc"; self._publish(False); return False
         except Exception as e:
-            if self.debug: self.log.debug("BLE round %d unexpected: %s", rid, e)
+            if self._dbg: self.log.debug("BLE round %d unexpected: %s", rid, e)
             self._fail_count += 1; self._consec_fails += 1
+            self._drop_handle_cache()   # z. B. struct.error: falsches Handle liefert zu kurze Daten
             self._schedule_next(success=False)
-            self.last_status = "exc"; return False
+            self.last_status = "exc"; self._publish(False); return False
         finally:
             self._busy = False
 
@@ -512,6 +892,8 @@ class DeviceSettings:
     def __init__(self, bus):
         self.bus = bus
         self._mem: Dict[str, float | int | str | bool] = {}
+        self._import_cache: Dict[str, VeDbusItemImport] = {}   # je Pfad nur ein Signal-Match
+        self._listeners: list = []   # cb(path, value) bei Änderung (set() oder Settings-Signal)
         self._load_file()
         self._sd = None
         if SettingsDevice is not None:
@@ -531,10 +913,7 @@ class DeviceSettings:
     def _save_file(self):
         try:
             os.makedirs(os.path.dirname(self.FILE), exist_ok=True)
-            tmp = self.FILE + ".tmp"
-            with open(tmp, "w") as f:
-                json.dump(self._mem, f)
-            os.replace(tmp, self.FILE)
+            atomic_write(self.FILE, json.dumps(self._mem).encode())
         except Exception:
             pass
 
@@ -561,12 +940,34 @@ class DeviceSettings:
             except Exception:
                 pass
 
+    def subscribe(self, cb):
+        """Änderungs-Listener registrieren: cb(path, value)."""
+        self._listeners.append(cb)
+
+    def _notify(self, path: str, value):
+        for cb in self._listeners:
+            try:
+                cb(path, value)
+            except Exception:
+                pass
+
+    def _on_change(self, path: str, changes):
+        val = changes.get("Value")
+        if self._mem.get(path) != val:
+            self._mem[path] = val
+            self._save_file()
+            self._notify(path, val)
+
     def get(self, path: str, default=None):
         if path in self._mem:
             return self._mem[path]
         # Falls SettingsService existiert und Pfad vorhanden ist, lesen:
         try:
-            item = VeDbusItemImport(self.bus, "com.victronenergy.settings", f"/{path}")
+            item = self._import_cache.get(path)
+            if item is None:
+                item = self._import_cache[path] = VeDbusItemImport(
+                    self.bus, "com.victronenergy.settings", f"/{path}",
+                    eventCallback=lambda _s, _p, ch, path=path: self._on_change(path, ch))
             val = item.get_value()
             self._mem[path] = val
             self._save_file()
@@ -581,6 +982,7 @@ class DeviceSettings:
     def set(self, path: str, value):
         self._mem[path] = value
         self._save_file()
+        self._notify(path, value)
         # Versuchen, über settingsdevice zu schreiben
         if self._sd is not None:
             try:
@@ -593,13 +995,19 @@ class DeviceSettings:
 # ───────────────── Generator-Service (optional) ───────────────
 class GeneratorService:
     """Grid/Generator-artiger Service, aktiviert bei Passthrough + TuyaPower > Schwelle."""
+    _P_RUNNING = "/Status/Running"
+    _P_POWER   = "/Ac/L1/Power"
+    _P_VOLTAGE = "/Ac/L1/Voltage"
+    _P_CURRENT = "/Ac/L1/Current"
+    _P_UI      = "/UpdateIndex"
+
     def __init__(self, bus, name: str, device_instance: int, power_limit_w: int = 3000, dry_run: bool = False):
         self.log = logging.getLogger("Gen")
         svc_cls = DummyVeDbusService if dry_run else VeDbusService
         self.svc = svc_cls(name, bus, register=False)
         self.add = self.svc.add_path
-        self.add("/Mgmt/ProcessName", __file__)
-        self.add("/Mgmt/ProcessVersion", "Python " + platform.python_version())
+        self.add("/Mgmt/ProcessName", _PROC_NAME)
+        self.add("/Mgmt/ProcessVersion", _PROC_VERSION)
         self.add("/ProductId", 0)
         self.add("/ProductName", "Generator (Tuya)")
         self.add("/DeviceInstance", device_instance)
@@ -612,6 +1020,8 @@ class GeneratorService:
         self.add("/Status/Running", 0)
         self.add("/UpdateIndex", 0, writeable=True)
         self.svc.register()
+        self._ui = 0                       # lokaler /UpdateIndex-Zähler (kein Read-Modify-Write)
+        self._shadow: Dict[str, object] = {}
         self.running = False
         self._last_change = 0.0
 
@@ -626,7 +1036,8 @@ class GeneratorService:
         self.min_run_s = float(min_run_s)
 
     def set_connected(self, on: bool):
-        self.svc["/Connected"] = 1 if on else 0
+        with publish_batch(self.svc) as s:   # velib: nur Schreibzugriffe über den gelieferten Kontext bündeln
+            _pub(s.__setitem__, self._shadow, "/Connected", 1 if on else 0)
 
     def update(self, passthrough: bool, tuya_power_w: float, voltage: float = 230.0):
         now = time.monotonic()
@@ -644,18 +1055,39 @@ class GeneratorService:
                     self.running = False
                     self._last_change = now
 
-        self.svc["/Status/Running"] = 1 if self.running else 0
-        self.svc["/Ac/L1/Power"] = float(tuya_power_w or 0.0) if self.running else 0.0
-        self.svc["/Ac/L1/Voltage"] = float(voltage if self.running else 0.0)
-        cur = (self.svc["/Ac/L1/Power"] / self.svc["/Ac/L1/Voltage"]) if (self.running and self.svc["/Ac/L1/Voltage"]>0) else 0.0
-        self.svc["/Ac/L1/Current"] = cur
-        self.svc["/UpdateIndex"] = (self.svc["/UpdateIndex"] + 1) % 256
+        if self.running:
+            p = float(tuya_power_w or 0.0); v = float(voltage)
+            cur = (p / v) if v > 0 else 0.0
+        else:
+            p = v = cur = 0.0
+        sh = self._shadow
+        with publish_batch(self.svc) as s:
+            set_ = s.__setitem__   # velib: ServiceContext, nicht der Service (sonst ein Signal je Pfad)
+            changed = (_pub(set_, sh, self._P_RUNNING, 1 if self.running else 0),
+                       _pub(set_, sh, self._P_POWER, p, _EPS_W),
+                       _pub(set_, sh, self._P_VOLTAGE, v, _EPS_VA),
+                       _pub(set_, sh, self._P_CURRENT, cur, _EPS_VA))
+            if any(changed):   # /UpdateIndex nur bei echter Änderung
+                self._ui = (self._ui + 1) & 0xFF
+                set_(self._P_UI, self._ui)
 
         if prev != self.running:
             self.log.info("GEN %s | power=%.0fW start>=%.0f stop<=%.0f minRun=%.0fs",
                           "START" if self.running else "STOP", tuya_power_w or 0.0, self.start_w, self.stop_w, self.min_run_s)
 
 # ───────────────── Bridge (Services & Logik) ──────────────────
+# TestMode-Setting als Int-Code (einmal beim Settings-Reload gemappt); Szenario-Namen → TM_SCENE
+TM_OFF, TM_OVERRIDE, TM_CUSTOM, TM_AUTO, TM_SCENE = 0, 1, 2, 3, 4
+_TM_CODES = {"off": TM_OFF, "override": TM_OVERRIDE, "custom": TM_CUSTOM, "auto": TM_AUTO}
+
+class _StateName:
+    """VE.Bus-State → Kurzname; der String entsteht erst, wenn ein Handler den Record formatiert."""
+    __slots__ = ("state",)
+    def __init__(self, state: int): self.state = state
+    def __str__(self):
+        s = self.state
+        return "Invert" if s == 9 else "Charge" if s in (4, 5) else "Standby"
+
 @dataclass
 class BridgeConfig:
     di_vebus: int = 40
@@ -686,9 +1118,18 @@ class Bridge:
     BMS priorisiert DC. Energiepfade werden integriert. Anti-Doppelzählung gemäß Formel:
       P_pv_ac = clamp( P_L1_out - max(0, -P_batt), 0, P_L1_out )
     """
-    def __init__(self, reader: OutbackReader, cfg: BridgeConfig, test_scene: Optional[str], settings: DeviceSettings):
+    PERSIST_CHECK_S = 15   # s, Intervall für pv_store.save_if_needed()
+
+    def __init__(self, reader: OutbackReader, cfg: BridgeConfig, test_scene: Optional[str], settings: DeviceSettings,
+                 pv_store: PvForwardStore):
         self.r = reader
         self.cfg = cfg
+        self.pv_store = pv_store
+        pv_store.start()
+        # im Tick genutzte Konfig-Werte als Instanz-Attribute
+        self._balance_check = bool(cfg.balance_check)
+        self._tuya_source = cfg.tuya_source
+        self._tuya_cli_power_w = float(cfg.tuya_cli_power_w)
         self.scene = test_scene or "day_charge"
         self.poll_ms = int(cfg.poll_ms)
         self.bus_main = dbusconnection()
@@ -702,8 +1143,13 @@ class Bridge:
 
         self.settings = settings
         self._init_settings_defaults()
+        # Tick liest nur self._s; Aktualisierung über Settings-Listener
+        self._tuya_cfg = None
+        self._reload_settings()
+        settings.subscribe(self._reload_settings)
 
         # Externe Quellen erkennen (BMS, ET112)
+        self._init_name_index()
         self._detect_external()
 
         # Services anlegen
@@ -715,22 +1161,44 @@ class Bridge:
         # Generator zunächst getrennt; Aktivierung via update()
         self.gen.set_connected(cfg.tuya_enabled)
 
+        # Schattenwerte je Service (siehe _pub)
+        self._shadow_vebus: Dict[str, object] = {}
+        self._shadow_pv: Dict[str, object] = {}
+        self._ui_vebus = 0; self._ui_pv = 0   # lokale /UpdateIndex-Zähler
+
         # Energiepfade (kWh)
         self._e = {"s2b":0.0, "s2i":0.0, "i2a":0.0, "b2i":0.0}
-        self._t_last = time.time()
-        self._last_summary = 0.0
+        # Tick-Zeitbasis monoton (NTP-Sprünge verfälschen weder dt noch Watchdog)
+        self._t_last = time.monotonic()
+        self._last_summary = -math.inf
 
         # Sanfte L1-Änderungen (Multi-L1)
         self._l1_prev = 0.0; self._l1_prev_ema = 0.0
 
         # Watchdog
-        self._last_reader_ok = time.time()
+        self._last_reader_ok = time.monotonic()
+
+        # Reader-I/O (BLE) im Worker-Thread; der Tick übernimmt nur den letzten Snapshot (1-Slot-Queue)
+        r = self.r
+        self._rx: deque = deque(maxlen=1)
+        self._snap: ReaderSnap = r.snapshot
+        self._rx_stop = threading.Event()
+        self._rx_thread = None
+        if not cfg.once:
+            self._rx_thread = threading.Thread(target=self._reader_loop, name="reader", daemon=True)
+            self._rx_thread.start()
 
         # CLI/Test: Dump-Signal
         signal.signal(signal.SIGUSR1, lambda *_: self._dump_now())
+        # Log-Level-Gates einmal bestimmen (Levels stehen nach setup_logging fest)
+        self._refresh_log_gates()
 
         if not cfg.once:
-            GLib.timeout_add(self.poll_ms, self._update)
+            # selbst-nachplanender One-Shot-Timer mit Driftkorrektur
+            self._next_tick = time.monotonic()
+            self._schedule_tick()
+            # Persistenz-Check mit Idle-Priorität, damit der Poll-Tick Vorrang behält
+            GLib.timeout_add_seconds(self.PERSIST_CHECK_S, self._persist, priority=GLib.PRIORITY_DEFAULT_IDLE)
 
     # ─── Settings-Defaults ───
     def _init_settings_defaults(self):
@@ -746,40 +1214,105 @@ class Bridge:
         self.settings.add("Settings/Devices/OutbackSPC/Tuya/MinRunS", 8,   "i")
         self.settings.add("Settings/Devices/OutbackSPC/Tuya/PowerW",  0,   "i")  # kann extern gesetzt werden
 
+    def _reload_settings(self, *_):
+        """Alle im Tick benötigten Settings einmalig lesen (Startup und bei jeder Änderung)."""
+        P = "Settings/Devices/OutbackSPC/"
+        g = self.settings.get
+        def _f(path, default=None):
+            v = g(P + path, default)
+            try:
+                return float(v) if v is not None else None
+            except (TypeError, ValueError):
+                return default
+        self._test_mode_code = _TM_CODES.get(str(g(P + "TestMode", "off")), TM_SCENE)
+        self._s = {
+            # Test-Overrides: None = Live-Wert verwenden
+            "test_dcv":   _f("Test/DCV"),
+            "test_dci":   _f("Test/DCI"),
+            "test_dcp":   _f("Test/DCP"),
+            "test_soc":   _f("Test/SOC"),
+            "tuya_enabled": bool(_f("Tuya/Enable", float(self.cfg.tuya_enabled))),
+            "tuya_power_w": _f("Tuya/PowerW", 0.0),
+            "tuya_cfg":   (_f("Tuya/StartW", 120.0), _f("Tuya/StopW", 60.0), _f("Tuya/MinRunS", 8.0)),
+            "summary_period_s": _f("SummaryPeriod", float(self.cfg.summary_period_s)),
+        }
+
     # ─── externe Quellen suchen ───
-    def _detect_external(self):
-        names = self.bus_main.list_names()
+    EXT_PREFIXES = ("com.victronenergy.battery.", "com.victronenergy.acload.")
+
+    def _init_name_index(self):
+        """Einmal ListNames, danach inkrementell über NameOwnerChanged (Neustarts von BMS/ET112 ohne Bridge-Neustart)."""
+        self._by_prefix: Dict[str, list] = {p: [] for p in self.EXT_PREFIXES}
+        self._bms_name = None; self._ac_names: tuple = ()
+        self.bms = None; self.bms_cache: Dict[str, object] = {}
+        self.ac = [None, None]; self.ac_cache: list = [None, None]
+        for n in self.bus_main.list_names():
+            self._index_name(str(n), True)
+        self.bus_main.add_signal_receiver(self._on_name_owner, signal_name="NameOwnerChanged",
+                                          dbus_interface="org.freedesktop.DBus")
+
+    def _index_name(self, name: str, present: bool) -> bool:
+        for p, lst in self._by_prefix.items():
+            if name.startswith(p):
+                if present:
+                    if name not in lst: bisect.insort(lst, name)
+                elif name in lst:
+                    lst.remove(name)
+                return True
+        return False
+
+    def _on_name_owner(self, name, _old_owner, new_owner):
+        if self._index_name(str(name), bool(new_owner)):
+            self._detect_external()
 
+    def _detect_external(self):
+        """Reine Index-Abfrage; Imports werden nur bei geänderter Auswahl neu angelegt."""
         # Battery-Monitor (erster Treffer)
-        self.bms = None
-        for n in names:
-            if n.startswith("com.victronenergy.battery."):
+        bl = self._by_prefix["com.victronenergy.battery."]
+        n = bl[0] if bl else None
+        if n != self._bms_name:
+            self._bms_name = n
+            self.bms = None
+            c = self.bms_cache = {}
+            if n:
                 self.bms = {
-                    "V":   VeDbusItemImport(self.bus_main, n, "/Dc/0/Voltage"),
-                    "I":   VeDbusItemImport(self.bus_main, n, "/Dc/0/Current"),
-                    "P":   VeDbusItemImport(self.bus_main, n, "/Dc/0/Power"),
-                    "SOC": VeDbusItemImport(self.bus_main, n, "/Soc"),
+                    "V":   self._ext_import(n, "/Dc/0/Voltage", c, "V"),
+                    "I":   self._ext_import(n, "/Dc/0/Current", c, "I"),
+                    "P":   self._ext_import(n, "/Dc/0/Power",   c, "P"),
+                    "SOC": self._ext_import(n, "/Soc",          c, "SOC"),
                 }
-                self.log_core.info("Battery-Monitor: %s", n)
-                break
+            self.log_core.info("Battery-Monitor: %s", n or "none")
 
         # ET112 → L2/L3
-        self.ac = [None, None]
-        ac_names = sorted(n for n in names if n.startswith("com.victronenergy.acload."))
-        for i, n in enumerate(ac_names[:2]):
-            self.ac[i] = {
-                "P": VeDbusItemImport(self.bus_main, n, "/Ac/L1/Power"),
-                "V": VeDbusItemImport(self.bus_main, n, "/Ac/L1/Voltage"),
-                "I": VeDbusItemImport(self.bus_main, n, "/Ac/L1/Current"),
-            }
-            self.log_core.info("ACLoad L%d: %s", i+2, n)
+        ac_names = tuple(self._by_prefix["com.victronenergy.acload."][:2])
+        if ac_names != self._ac_names:
+            self._ac_names = ac_names
+            self.ac = [None, None]
+            self.ac_cache = [None, None]
+            for i, n in enumerate(ac_names):
+                c = self.ac_cache[i] = {}
+                self.ac[i] = {
+                    "P": self._ext_import(n, "/Ac/L1/Power",   c, "P"),
+                    "V": self._ext_import(n, "/Ac/L1/Voltage", c, "V"),
+                    "I": self._ext_import(n, "/Ac/L1/Current", c, "I"),
+                }
+                self.log_core.info("ACLoad L%d: %s", i+2, n)
+
+    def _ext_import(self, service: str, path: str, cache: Dict[str, object], key: str):
+        """VeDbusItemImport mit Änderungs-Callback: hält cache[key] aktuell, der Tick liest nur den Cache.
+        Einmaliges Befüllen beim Anlegen; danach ausschließlich über PropertiesChanged."""
+        def _on_change(_svc, _path, changes):
+            cache[key] = changes.get("Value")
+        item = VeDbusItemImport(self.bus_main, service, path, eventCallback=_on_change)
+        cache[key] = item.get_value()
+        return item
 
     # ─── VE.Bus Service ───
     def _svc_vebus(self, hci: str, svc_cls) -> VeDbusService:
         s = svc_cls(f"com.victronenergy.vebus.{hci}", self.bus_main, register=False)
         add = s.add_path
-        add("/Mgmt/ProcessName", __file__)
-        add("/Mgmt/ProcessVersion", "Python " + platform.python_version())
+        add("/Mgmt/ProcessName", _PROC_NAME)
+        add("/Mgmt/ProcessVersion", _PROC_VERSION)
         add("/Mgmt/Connection", "TEST" if self.r.test else f"Bluetooth {hci}")
         add("/DeviceInstance", self.cfg.di_vebus)
         add("/ProductId", 0xFFFF)
@@ -787,17 +1320,14 @@ class Bridge:
         add("/FirmwareVersion", VERSION)
         add("/Connected", 1)
 
-        fmt = lambda u:(lambda _p,v:f"{v:.1f}{u}")
-        _w,_v,_a,_h,_p = fmt(" W"),fmt(" V"),fmt(" A"),fmt(" Hz"),fmt("%")
-
         for ph, limit in (("L1", self.cfg.l1_limit), ("L2", self.cfg.l2_limit), ("L3", self.cfg.l3_limit)):
-            for m,cb in (("P",_w),("V",_v),("I",_a),("F",_h)):
+            for m,cb in (("P",FMT_W),("V",FMT_V),("I",FMT_A),("F",FMT_HZ)):
                 add(f"/Ac/Out/{ph}/{m}", 0.0, gettextcallback=cb)
             add(f"/Ac/Out/{ph}/PowerLimit", float(limit))
 
-        for p,cb in (("/Dc/0/Voltage",_v),("/Dc/0/Current",_a),("/Dc/0/Power",_w)):
+        for p,cb in (("/Dc/0/Voltage",FMT_V),("/Dc/0/Current",FMT_A),("/Dc/0/Power",FMT_W)):
             add(p, 0.0, gettextcallback=cb)
-        add("/Soc", 0.0, gettextcallback=_p)
+        add("/Soc", 0.0, gettextcallback=FMT_PCT)
 
         # Energiepfade (kWh)
         for ep in ("/Energy/SolarToBattery","/Energy/SolarToInverter",
@@ -816,8 +1346,8 @@ class Bridge:
     def _svc_pvinverter(self, hci: str, svc_cls) -> VeDbusService:
         s = svc_cls(f"com.victronenergy.pvinverter.{hci}", self.bus_pv, register=False)
         add = s.add_path
-        add("/Mgmt/ProcessName", __file__)
-        add("/Mgmt/ProcessVersion", "Python " + platform.python_version())
+        add("/Mgmt/ProcessName", _PROC_NAME)
+        add("/Mgmt/ProcessVersion", _PROC_VERSION)
         add("/Mgmt/Connection", "Virtual PV @ AC-Out (L1)")
         add("/DeviceInstance", self.cfg.di_pvinv)
         add("/ProductId", 0)
@@ -825,10 +1355,9 @@ class Bridge:
         add("/FirmwareVersion", VERSION)
         add("/Connected", 1)
 
-        _w = (lambda _p,v:f"{v:.1f} W")
-        add("/Ac/Power", 0.0, gettextcallback=_w)
+        add("/Ac/Power", 0.0, gettextcallback=FMT_W)
         for ph in ("L1","L2","L3"):
-            add(f"/Ac/{ph}/Power", 0.0, gettextcallback=_w)
+            add(f"/Ac/{ph}/Power", 0.0, gettextcallback=FMT_W)
         # Forward-Zähler (kWh)
         add("/Ac/L1/Energy/Forward", 0.0)
         add("/Ac/Energy/Forward",    0.0)  # optionaler Gesamtzähler (hier identisch L1)
@@ -840,90 +1369,121 @@ class Bridge:
         self.log_core.info("registered PV-Inverter as com.victronenergy.pvinverter.%s", hci)
         return s
 
-    # ─── Energie-Integrator ───
-    @staticmethod
-    def _kwh(acc: float, p_w: float, dt_s: float) -> float:
-        return acc + (p_w * (dt_s/3600.0)) / 1000.0
-
     # ─── Hilfen ───
     def _acload(self, idx: int, key: str) -> float:
-        try:
-            if self.ac[idx]:
-                return float(self.ac[idx][key].get_value())
-        except Exception:
-            pass
+        c = self.ac_cache[idx]
+        if c:
+            try:
+                return float(c[key])
+            except Exception:
+                pass
         return 0.0
 
-    def _read_bms(self):
+    def _read_bms(self, r_dcV: float, r_dcI: float):
         """Bevorzugt BMS; liefert (dcV, dcI, dcP, soc, source)"""
         used_dc = "Outback"
         soc = None
-        if getattr(self, "bms", None):
+        c = self.bms_cache
+        if c:
             try:
-                dcV = float(self.bms["V"].get_value())
-                dcI = float(self.bms["I"].get_value())
-                dcP = float(self.bms["P"].get_value())
-                soc = float(self.bms["SOC"].get_value())
+                dcV = float(c["V"])
+                dcI = float(c["I"])
+                dcP = float(c["P"])
+                soc = float(c["SOC"])
                 used_dc = "BMS"
                 return dcV, dcI, dcP, soc, used_dc
             except Exception:
                 pass
         # Fallback Outback (nur wenn BMS nicht greifbar)
-        dcV = float(self.r.dcV); dcI = float(self.r.dcI); dcP = dcV*dcI
+        dcV = float(r_dcV); dcI = float(r_dcI); dcP = dcV*dcI
         return dcV, dcI, dcP, soc, used_dc
 
     def _pv_write(self, p_l1_w: float, dt_s: float):
         """Schreibt PV-Leistung & integriert Forward-Zähler."""
-        self.pvinv["/Ac/L1/Power"] = p_l1_w
-        self.pvinv["/Ac/Power"]    = p_l1_w
-        self.pvinv["/Ac/L2/Power"] = 0.0
-        self.pvinv["/Ac/L3/Power"] = 0.0
-        PV_STORE.integrate(p_l1_w, dt_s)
-        total, day, date = PV_STORE.snapshot()
-        self.pvinv["/Ac/L1/Energy/Forward"] = total
-        self.pvinv["/Ac/Energy/Forward"]    = total
-        self.pvinv["/UpdateIndex"] = (self.pvinv["/UpdateIndex"] + 1) % 256
+        self.pv_store.integrate(p_l1_w, dt_s)
+        total, day, date = self.pv_store.snapshot()
+        sh = self._shadow_pv
+        with publish_batch(self.pvinv) as pv:
+            set_ = pv.__setitem__
+            changed = (_pub(set_, sh, "/Ac/L1/Power", p_l1_w, _EPS_W),
+                       _pub(set_, sh, "/Ac/Power",    p_l1_w, _EPS_W),
+                       _pub(set_, sh, "/Ac/L2/Power", 0.0),
+                       _pub(set_, sh, "/Ac/L3/Power", 0.0),
+                       _pub(set_, sh, "/Ac/L1/Energy/Forward", total, _EPS_KWH),
+                       _pub(set_, sh, "/Ac/Energy/Forward",    total, _EPS_KWH))
+            if any(changed):   # /UpdateIndex nur bei echter Änderung
+                self._ui_pv = (self._ui_pv + 1) & 0xFF
+                set_("/UpdateIndex", self._ui_pv)
         self.log_pv.info("l1_pv=%dW → pvinverter:/Ac/L1/Power | fwd_total=%.3fkWh (day %.3f @ %s)",
                          int(round(p_l1_w)), total, day, date)
 
+    # ─── Reader (Worker-Thread bzw. inline bei --once) ───
+    def _read_round(self) -> bool:
+        r = self.r; seen = r.snapshot
+        ok = r.read()
+        if ok:
+            self._last_reader_ok = time.monotonic()
+            sn = r.snapshot
+            if sn is not seen and sn.ok:
+                self._rx.append(sn)
+        return ok
+
+    def _reader_loop(self):
+        r = self.r; stop = self._rx_stop
+        while not stop.is_set():
+            try:
+                self._read_round()
+            except Exception as e:
+                self.log_core.warning("reader worker: %s", e)
+            # bis zur nächsten fälligen Runde schlafen (max. 1s, damit Stop zügig greift)
+            stop.wait(min(1.0, max(0.05, r._next_round_at - time.time())))
+
+    def _refresh_log_gates(self):
+        self._core_info_enabled = self.log_core.isEnabledFor(logging.INFO)
+        self._pv_debug_enabled  = self.log_pv.isEnabledFor(logging.DEBUG)
+        self.r.refresh_log_gate()
+
     def _dump_now(self):
-        total, day, date = PV_STORE.snapshot()
+        total, day, date = self.pv_store.snapshot()
         self.log_core.info("DUMP  PV_forward_total=%.3fkWh  PV_day=%.3fkWh (%s)  E: %s",
                            total, day, date, json.dumps(self._e, sort_keys=True))
 
     # ─── Haupt-Tick ───
     def tick(self) -> bool:
-        now = time.time()
+        now = time.monotonic()
         dt  = max(0.0, now - self._t_last)
         self._t_last = now
 
-        ok = self.r.read()
-        if ok:
-            self._last_reader_ok = now
-        else:
-            if (now - self._last_reader_ok) > 10.0:
-                self.log_core.warning("Reader stalled > 10s (status=%s)", getattr(self.r,"last_status","n/a"))
+        if self._rx_thread is None:
+            self._read_round()
+        if (now - self._last_reader_ok) > 10.0:
+            self.log_core.warning("Reader stalled > 10s (status=%s)", self.r.snapshot.last_status)
+        # nicht-blockierend: neuer Snapshot oder der letzte gute
+        try:
+            self._snap = self._rx.pop()
+        except IndexError:
+            pass
+        sn = self._snap
 
         # DC vom BMS bevorzugen
-        dcV, dcI, dcP, soc, used_dc = self._read_bms()
+        dcV, dcI, dcP, soc, used_dc = self._read_bms(sn.dcV, sn.dcI)
 
         # Testmodus ggf. überschreiben/erzwingen
-        test_mode = str(self.settings.get("Settings/Devices/OutbackSPC/TestMode", "off"))
-        if test_mode in ("override", "custom"):
+        s = self._s
+        if self._test_mode_code in (TM_OVERRIDE, TM_CUSTOM):
             # Override-Werte aus Settings (falls gesetzt)
-            dcV = float(self.settings.get("Settings/Devices/OutbackSPC/Test/DCV", dcV))
-            dcI = float(self.settings.get("Settings/Devices/OutbackSPC/Test/DCI", dcI))
-            dcP = float(self.settings.get("Settings/Devices/OutbackSPC/Test/DCP", dcV*dcI))
-            soc = float(self.settings.get("Settings/Devices/OutbackSPC/Test/SOC", soc if soc is not None else 50.0))
-        # Heartbeat sicherstellen: wir schreiben ohnehin jede Sekunde
+            if s["test_dcv"] is not None: dcV = s["test_dcv"]
+            if s["test_dci"] is not None: dcI = s["test_dci"]
+            dcP = s["test_dcp"] if s["test_dcp"] is not None else dcV*dcI
+            soc = s["test_soc"] if s["test_soc"] is not None else (soc if soc is not None else 50.0)
 
         # L2/L3 (ET112)
         L2P, L2V, L2I = self._acload(0,"P"), self._acload(0,"V"), self._acload(0,"I")
         L3P, L3V, L3I = self._acload(1,"P"), self._acload(1,"V"), self._acload(1,"I")
 
         # Outback Snapshot
-        L1_meas= max(0.0, float(self.r.acP_active or 0.0))
-        acV    = max(0.0, float(self.r.acV)); acF = max(0.0, float(self.r.acF))
+        L1_meas= max(0.0, float(sn.acP_active or 0.0))
+        acV    = max(0.0, float(sn.acV)); acF = max(0.0, float(sn.acF))
 
         # ── Anti-Doppelzählung: PV-AC-Anteil exakt nach Formel ───────────────
         # P_pv_ac = clamp( P_L1_out - max(0, -P_batt), 0, P_L1_out )
@@ -943,43 +1503,20 @@ class Bridge:
         L1_multi = max(0.0, l1_smoothed)
 
         # ── Energiepfade integrieren (kWh) ───────────────────────
-        e0 = self._e.copy()
+        e = self._e; k = dt * _DT_TO_KWH   # Faktor einmal je Tick
         # Solar→Inverter = PV-AC-Anteil auf L1
-        self._e["s2i"] = self._kwh(self._e["s2i"], pv_ac_l1, dt)
-        # Solar→Battery ~ pos. DC-Leistung (vereinfachte Zuordnung)
-        if dcP > 0.0:
-            self._e["s2b"] = self._kwh(self._e["s2b"], dcP, dt)
+        e["s2i"] += pv_ac_l1 * k
         # Inverter→AC-Out (nur Multi-L1-Anteil)
-        self._e["i2a"] = self._kwh(self._e["i2a"], L1_multi, dt)
-        # Battery→Inverter (Entladung)
-        if dcP < 0.0:
-            self._e["b2i"] = self._kwh(self._e["b2i"], abs(dcP), dt)
+        e["i2a"] += L1_multi * k
+        # Solar→Battery ~ pos. DC-Leistung (vereinfachte Zuordnung), Battery→Inverter (Entladung)
+        if dcP > 0.0:
+            e["s2b"] += dcP * k
+        elif dcP < 0.0:
+            e["b2i"] -= dcP * k
 
         # ── Schreiben: PV-Inverter (L1) + Forward-Zähler ─────────
         self._pv_write(pv_ac_l1, dt)
 
-        # ── Schreiben: Multi / VE.Bus ────────────────────────────
-        m = self.vebus
-        # DC
-        m["/Dc/0/Voltage"], m["/Dc/0/Current"], m["/Dc/0/Power"] = dcV, dcI, dcP
-        if soc is not None:
-            m["/Soc"] = clamp(float(soc), 0.0, 100.0)
-
-        # AC-Out
-        m["/Ac/Out/L1/P"] = L1_multi
-        m["/Ac/Out/L1/V"] = acV
-        m["/Ac/Out/L1/I"] = (L1_multi/acV) if acV else 0.0
-        m["/Ac/Out/L1/F"] = acF
-
-        m["/Ac/Out/L2/P"], m["/Ac/Out/L2/V"], m["/Ac/Out/L2/I"], m["/Ac/Out/L2/F"] = L2P, L2V, L2I, acF
-        m["/Ac/Out/L3/P"], m["/Ac/Out/L3/V"], m["/Ac/Out/L3/I"], m["/Ac/Out/L3/F"] = L3P, L3V, L3I, acF
-
-        # Energiepfade (kWh)
-        m["/Energy/SolarToInverter"]   = self._e["s2i"]
-        m["/Energy/SolarToBattery"]    = self._e["s2b"]
-        m["/Energy/InverterToAcOut"]   = self._e["i2a"]
-        m["/Energy/BatteryToInverter"] = self._e["b2i"]
-
         # Mode/State (heuristisch, wie v3 – leicht justiert)
         total_ac = L1_multi + L2P + L3P + pv_ac_l1
         if pv_ac_l1 > 80 and dcP >= 30:
@@ -990,23 +1527,48 @@ class Bridge:
             mode, state = 3, 9     # Inverting
         else:
             mode, state = 3, 11    # Passthru/Stand-by
-        m["/Mode"], m["/State"] = mode, state
 
-        m["/UpdateIndex"] = (m["/UpdateIndex"] + 1) % 256
+        # ── Schreiben: Multi / VE.Bus (ein ItemsChanged pro Tick) ─
+        with publish_batch(self.vebus) as m:
+            sh = self._shadow_vebus; hits = []
+            pub = lambda path, value, eps=0.0: hits.append(_pub(m.__setitem__, sh, path, value, eps))
+            # DC
+            pub("/Dc/0/Voltage", dcV, _EPS_VA); pub("/Dc/0/Current", dcI, _EPS_VA); pub("/Dc/0/Power", dcP, _EPS_W)
+            if soc is not None:
+                pub("/Soc", clamp(float(soc), 0.0, 100.0), _EPS_VA)
+
+            # AC-Out
+            pub("/Ac/Out/L1/P", L1_multi, _EPS_W)
+            pub("/Ac/Out/L1/V", acV, _EPS_VA)
+            pub("/Ac/Out/L1/I", (L1_multi/acV) if acV else 0.0, _EPS_VA)
+            pub("/Ac/Out/L1/F", acF, _EPS_VA)
+
+            pub("/Ac/Out/L2/P", L2P, _EPS_W); pub("/Ac/Out/L2/V", L2V, _EPS_VA); pub("/Ac/Out/L2/I", L2I, _EPS_VA); pub("/Ac/Out/L2/F", acF, _EPS_VA)
+            pub("/Ac/Out/L3/P", L3P, _EPS_W); pub("/Ac/Out/L3/V", L3V, _EPS_VA); pub("/Ac/Out/L3/I", L3I, _EPS_VA); pub("/Ac/Out/L3/F", acF, _EPS_VA)
+
+            # Energiepfade (kWh)
+            pub("/Energy/SolarToInverter",   e["s2i"], _EPS_KWH)
+            pub("/Energy/SolarToBattery",    e["s2b"], _EPS_KWH)
+            pub("/Energy/InverterToAcOut",   e["i2a"], _EPS_KWH)
+            pub("/Energy/BatteryToInverter", e["b2i"], _EPS_KWH)
+
+            pub("/Mode", mode); pub("/State", state)
+
+            if any(hits):   # /UpdateIndex nur bei echter Änderung
+                self._ui_vebus = (self._ui_vebus + 1) & 0xFF
+                m["/UpdateIndex"] = self._ui_vebus
 
         # ── Generator-Logik ──────────────────────────────────────
-        tuya_enabled = bool(int(self.settings.get("Settings/Devices/OutbackSPC/Tuya/Enable", int(self.cfg.tuya_enabled))))
-        if tuya_enabled and self.cfg.tuya_source != "off":
+        if s["tuya_enabled"] and self._tuya_source != "off":
             # Quelle bestimmen
-            if self.cfg.tuya_source == "cli":
-                tuya_power = float(self.cfg.tuya_cli_power_w)
+            if self._tuya_source == "cli":
+                tuya_power = self._tuya_cli_power_w
             else:
-                tuya_power = float(self.settings.get("Settings/Devices/OutbackSPC/Tuya/PowerW", 0))
-            self.gen.configure(
-                start_w=float(self.settings.get("Settings/Devices/OutbackSPC/Tuya/StartW", 120)),
-                stop_w=float(self.settings.get("Settings/Devices/OutbackSPC/Tuya/StopW", 60)),
-                min_run_s=float(self.settings.get("Settings/Devices/OutbackSPC/Tuya/MinRunS", 8))
-            )
+                tuya_power = s["tuya_power_w"]
+            # Schwellen nur bei Änderung übernehmen
+            if s["tuya_cfg"] != self._tuya_cfg:
+                self._tuya_cfg = s["tuya_cfg"]
+                self.gen.configure(*self._tuya_cfg)
             self.gen.set_connected(True)
             self.gen.update(passthrough=(state==11), tuya_power_w=tuya_power, voltage=acV or 230.0)
         else:
@@ -1014,17 +1576,19 @@ class Bridge:
             self.gen.update(False, 0.0, voltage=0.0)
 
         # ── Logging (kompakt + Debug-Rechenweg) ─────────────────
-        self.log_core.info("INV   l1_out=%dW | batt=%+dW | state=%s",
-                           int(round(L1_multi)), int(round(dcP)), ("Invert" if state==9 else "Charge" if state in (4,5) else "Standby"))
-        if logging.getLogger().isEnabledFor(logging.DEBUG):
+        info = self._core_info_enabled
+        if info:
+            self.log_core.info("INV   l1_out=%dW | batt=%+dW | state=%s",
+                               int(round(L1_multi)), int(round(dcP)), _StateName(state))
+        if self._pv_debug_enabled:
             self.log_pv.debug(
                 "calc: P_pv_ac=clamp(L1(%d)-max(0,-Batt(%d)),0,%d)=%dW",
                 int(round(L1_meas)), int(round(dcP)), int(round(L1_meas)), int(round(pv_ac_l1))
             )
 
         # Summenzeile periodisch
-        sp = float(self.settings.get("Settings/Devices/OutbackSPC/SummaryPeriod", self.cfg.summary_period_s))
-        if sp > 0 and (now - self._last_summary) >= sp:
+        sp = s["summary_period_s"]
+        if info and sp > 0 and (now - self._last_summary) >= sp:
             self._last_summary = now
             self.log_core.info(
                 "SUM   L1=%d L2=%d L3=%d | PV_ac=%d | GEN=%d | BATT=%+d%s",
@@ -1036,25 +1600,36 @@ class Bridge:
             )
 
         # Balance-Check (optional)
-        if self.cfg.balance_check:
+        if self._balance_check:
             # Erwartung: L1_meas ≈ pv_ac_l1 + L1_multi (bis auf Glättung)
-            resid = L1_meas - (pv_ac_l1 + L1_multi)
-            if abs(resid) > 50.0:  # Toleranz
+            resid = L1_meas - pv_ac_l1 - L1_multi
+            if resid > 50.0 or resid < -50.0:  # Toleranz
                 self.log_core.warning("balance: L1=%.0f vs pv_ac(%.0f)+multi(%.0f) resid=%.0f",
                                       L1_meas, pv_ac_l1, L1_multi, resid)
 
-        # Persistenz-Fortschreibung ggf. speichern
-        PV_STORE.save_if_needed(force=False)
-
         return True
 
     # GLib-Timer
+    def _persist(self) -> bool:
+        self.pv_store.save_if_needed(force=False)
+        return True
+
+    def _schedule_tick(self):
+        """Nächsten Tick auf das feste Raster legen; liegt er schon zurück (Stall), Raster neu ab jetzt."""
+        period = self.poll_ms / 1000.0
+        now = time.monotonic()
+        self._next_tick += period
+        if self._next_tick <= now:
+            self._next_tick = now + period
+        GLib.timeout_add(max(1, int((self._next_tick - now) * 1000.0)), self._update)
+
     def _update(self) -> bool:
         try:
-            return self.tick()
+            self.tick()
         except Exception as e:
-            self.log_core.error("update exception: %s", e)
-            return True  # weiterlaufen
+            self.log_core.error("update exception: %s", e)  # weiterlaufen
+        self._schedule_tick()
+        return False   # One-Shot; Nachplanung über _schedule_tick()
 
 # ───────────────── CLI/Start ──────────────────────────────────
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -1157,7 +1732,11 @@ def main():
         tuya_cli_power_w=args.tuya_power
     )
 
-    br = Bridge(reader, cfg, (args.test if args.test!="off" else None), dev_settings)
+    # PV-Zähler erst hier öffnen (Verzeichnis, WAL; Worker startet Bridge) – ein bloßer Import bleibt ohne Seiteneffekte
+    pv_store = PvForwardStore()
+    atexit.register(pv_store.close)
+
+    br = Bridge(reader, cfg, (args.test if args.test!="off" else None), dev_settings, pv_store)
 
     if args.dump_now:
         br._dump_now()
@@ -1165,7 +1744,7 @@ def main():
     # Einmaliger Tick?
     if cfg.once:
         br.tick()
-        PV_STORE.save_if_needed(force=True)
+        pv_store.save_if_needed(force=True)
         log.info("Once-mode done.")
         return
 
@@ -1175,7 +1754,7 @@ def main():
     except KeyboardInterrupt:
         log.info("Exiting…")
     finally:
-        PV_STORE.save_if_needed(force=True)
+        pv_store.save_if_needed(force=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
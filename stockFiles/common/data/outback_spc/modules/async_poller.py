@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Hintergrund-Poller für blockierende Quellen (Tuya-TCP, später Modbus):
+- fn() läuft in einem Daemon-Thread, period s Pause zwischen zwei Aufrufen
+- latest() liefert den letzten erfolgreichen Wert, ohne die Hauptschleife zu blockieren
+"""
+
+import logging
+import threading
+
+log = logging.getLogger("POLL")
+
+
+class AsyncPoller:
+    __slots__ = ("_fn", "period", "_value", "_stop", "_thread")
+
+    def __init__(self, fn, period: float = 1.0, default: float = 0.0, name: str = "poller"):
+        self._fn = fn
+        self.period = float(period)
+        self._value = default   # einzelne Referenz-Zuweisung → unter dem GIL atomar, kein Lock nötig
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> "AsyncPoller":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def latest(self):
+        return self._value
+
+    def _run(self):
+        while True:
+            try:
+                self._value = self._fn()
+            except Exception:
+                log.debug("poll %s failed", self._thread.name, exc_info=True)   # alter Wert bleibt stehen
+            if self._stop.wait(self.period):
+                return
@@ -3,7 +3,7 @@
 BLE-Client (v3-stabil, bluepy/public, minimal)
 ----------------------------------------------
 - Verwendet denselben Connect/Read-Flow wie deine funktionierende v3.0
-- Kein Thread-Timeout, kein HCI-Fallback, kein Auto-AddrType
+- Kein Thread-Timeout (optional: SIGALRM-Timeout im Main-Thread), kein HCI-Fallback, kein Auto-AddrType
 - Deterministisch: Adapter = --hci (Standard hci0), addrType = public
 - Ausgabe-Format kompatibel zur neuen Bridge (snapshot/get_status)
 
@@ -12,7 +12,7 @@ Hinweis:
 """
 
 from __future__ import annotations
-import time, struct, os, re, logging
+import time, struct, os, re, logging, functools, contextlib, signal, threading
 from typing import Optional, Dict, Tuple
 
 # bluepy
@@ -24,25 +24,38 @@ except Exception:
 
 log_ble = logging.getLogger("BLE")
 
+# Uhren einmal binden (kein LOAD_GLOBAL+LOAD_ATTR je Aufruf im Snapshot-Pfad)
+_mono = time.monotonic
+_wall = time.time
+
 # GATT UUIDs (A03/A11)
 _SRV_1810 = '00001810-0000-1000-8000-00805f9b34fb'
 _SRV_1811 = '00001811-0000-1000-8000-00805f9b34fb'
 _A03      = '00002a03-0000-1000-8000-00805f9b34fb'
 _A11      = '00002a11-0000-1000-8000-00805f9b34fb'
 
+# v3-Backoff-Leiter (s, nach consec_fails)
+_BACKOFF_LADDER = (1.0, 2.0, 4.0, 8.0, 12.0)
+
 # Heuristik-State (für Feld "state")
 STATE_INVERT = 1
 
 # MAC-Utils
-_MAC_RE = re.compile(r"^[0-9A-F]{12}$")
+_NON_HEX = bytes(b for b in range(256) if b not in b"0123456789ABCDEF")
 def _normalize_mac(s: str) -> str:
+    # ein C-Durchlauf (bytes.translate mit Löschtabelle) statt Zeichen-Schleife: Nicht-Hex verwerfen, genau 12 Hex-Ziffern
     if not s: return ""
-    raw = re.sub(r"[^0-9A-Fa-f]", "", s).upper()
-    if not _MAC_RE.match(raw): return ""
-    return ":".join(raw[i:i+2] for i in range(0, 12, 2))
+    raw = s.upper().encode("ascii", "ignore").translate(None, _NON_HEX).decode()
+    if len(raw) != 12: return ""
+    return ":".join((raw[0:2], raw[2:4], raw[4:6], raw[6:8], raw[8:10], raw[10:12]))
 
 def _resolve_mac(cli: Optional[str]) -> Tuple[str, str]:
-    m = _normalize_mac(cli or "")
+    return _resolve_mac_cached(cli or "")
+
+# Ergebnis ist je Prozess konstant → utils-Import/ENV/Normalisierung nur beim ersten Aufruf je CLI-Wert
+@functools.lru_cache(maxsize=8)
+def _resolve_mac_cached(cli: str) -> Tuple[str, str]:
+    m = _normalize_mac(cli)
     if m: return m, "CLI"
     env = _normalize_mac(os.getenv("OUTBACK_BLE_MAC", ""))
     if env: return env, "ENV"
@@ -55,48 +68,117 @@ def _resolve_mac(cli: Optional[str]) -> Tuple[str, str]:
 
     return "", "none"
 
-# Swap/Decode wie v3
-def _swap_decode(buf: bytes) -> tuple:
-    shorts = struct.unpack('>' + 'h' * (len(buf)//2), buf)
-    return tuple(((v >> 8) & 255) | ((v & 255) << 8) for v in shorts)
+@functools.lru_cache(maxsize=4)
+def _resolve_addrtype(cli: str = "") -> str:
+    """BLE-Adresstyp: CLI → ENV OUTBACK_BLE_ADDRTYPE → "public" (v3); je Prozess/CLI-Wert nur einmal."""
+    for v in (cli, os.getenv("OUTBACK_BLE_ADDRTYPE", "")):
+        v = (v or "").strip().lower()
+        if v in ("public", "random"): return v
+    return "public"
+
+# Nur die genutzten Felder dekodieren (Pad-Bytes überspringen) → 5 bzw. 2 ints statt ganzer Frames
+_A03_UNPACK = struct.Struct('<4x2H2xH4x2H').unpack_from   # A03[2]=acV, [3]=acF, [5]=L1-Leistung, [8]=dcV, [9]=dcI
+_A11_UNPACK = struct.Struct('<12x2H').unpack_from         # A11[6]=pvV, [7]=pvP
+
+# Optionaler Operations-Timeout ohne Hilfsthread: SIGALRM/ITIMER_REAL (nur im Main-Thread wirksam)
+def _raise_timeout(_sig, _frm):
+    raise TimeoutError("BLE operation timeout")
+
+_MAIN_THREAD = threading.main_thread()
+
+@contextlib.contextmanager
+def _alarm(sec: float):
+    if sec <= 0 or threading.current_thread() is not _MAIN_THREAD:
+        yield; return
+    old = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, sec)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, old)
 
 class BleOutbackClient:
     """
     v3-stabiler BLE-Client:
-      - snapshot() -> Dict oder None (A03+A11 in einer Runde)
+      - snapshot() -> Dict oder None (A03+A11 in einer Runde; Dict wird wiederverwendet)
       - get_status() -> Dict (für Logs)
     """
 
+    # feste Attributliste: kein Instanz-__dict__, Slot-Zugriff im Snapshot-Pfad
+    __slots__ = ("mac", "_mac_src", "hci", "conn_min_units", "conn_max_units", "_conn_tuned", "op_timeout_s",
+                 "min_interval_s", "backoff_max_s", "_bo", "debug", "_dbg", "_log_debug",
+                 "_p", "_c03", "_c11", "_h03", "_h11", "_rd", "_getrssi", "_rssi_next", "_hc", "_hc_ok", "_connected", "_out",
+                 "notify", "_nt", "_n03", "_n11", "_n03_new", "_n11_new",
+                 "_busy", "_next_at", "_ok", "_fail", "_consec_fails", "_last_metrics_ts", "_last_link_ts",
+                 "_warm_after", "_acc_read_ms", "_acc_skew_ms",
+                 "last_status", "last_error", "backend", "addr_type")
+
     BASE_MIN_INTERVAL = 1.8   # exakt wie v3
     BACKOFF_MAX       = 15.0  # v3-Backoff-Leiter
+    SUPERVISION_TIMEOUT_S = 20.0  # Link-Supervision (typ.); Keep-Alive ab der Hälfte Leerlauf
+    RSSI_REFRESH_S        = 10.0  # RSSI (HCI-Roundtrip) höchstens so oft abfragen
+    SOFT_FAIL_RECONNECT   = 5     # weiche BTLE-Fehler in Folge, ab denen doch neu verbunden wird
+    CONN_MIN_UNITS        = 8     # LE-Connection-Interval (×1.25 ms) → 10 ms
+    CONN_MAX_UNITS        = 12    # → 15 ms
+    _DEBUGFS = "/sys/kernel/debug/bluetooth/%s/%s"
+
+    # "harte" BTLE-Fehler → Verbindung ist weg, Reconnect nötig
+    _HARD_ERR_RE = re.compile(r"(?:Helper not started|Not connected|Device disconnected)")
 
     def __init__(self, mac: str = "", hci: str = "hci0",
                  min_interval_s: float = BASE_MIN_INTERVAL, backoff_max_s: float = BACKOFF_MAX,
-                 debug: bool = False):
+                 debug: bool = False, conn_min_units: int = CONN_MIN_UNITS, conn_max_units: int = CONN_MAX_UNITS,
+                 op_timeout_s: float = 0.0, handles: Optional[Tuple[int, int]] = None, notify: bool = False,
+                 addr_type: str = ""):
         self.mac, self._mac_src = _resolve_mac(mac)
         self.hci = hci
+        fast = os.environ.get("OUTBACK_BLE_FAST_INTERVAL", "1").strip().lower() not in ("0", "false", "no", "off")
+        self.conn_min_units = int(conn_min_units or 0) if fast else 0   # 0 → Kernel-Default belassen
+        self.conn_max_units = int(conn_max_units or 0) if fast else 0
+        self._conn_tuned = False
+        self.op_timeout_s = float(op_timeout_s or 0.0)   # 0 → wie v3 ohne Timeout
         self.min_interval_s = float(min_interval_s or self.BASE_MIN_INTERVAL)
         self.backoff_max_s  = float(backoff_max_s  or self.BACKOFF_MAX)
+        self._bo = tuple(min(v, self.backoff_max_s) for v in _BACKOFF_LADDER)   # bereits auf backoff_max geklemmt
         self.debug = bool(debug)
+        self.refresh_log_gate()
 
         # bluepy Verbindungsobjekte
         self._p = None; self._c03 = None; self._c11 = None
+        self._h03 = self._h11 = 0; self._rd = None
+        self._getrssi = None      # optionale RSSI-Methode des Backends, je Verbindung aufgelöst
+        self._rssi_next = 0.0     # nächste fällige RSSI-Abfrage (monotonic); dazwischen letzter Wert in _out
+        # Handle-Cache (A03, A11): Reconnect ohne GATT-Discovery; Vorgabe z. B. aus state.json
+        self._hc = (int(handles[0]), int(handles[1])) if handles and all(handles) else None
+        self._hc_ok = False       # Cache auf dieser Verbindung schon mit einer gültigen Runde bestätigt
+        self._connected = False   # Peripheral besteht (ggf. noch ohne Service-Discovery)
+        # optionale GATT-Notifications: jüngste Rohdaten je Characteristic + Empfangszeit (monotonic)
+        self.notify = bool(notify); self._nt = False
+        self._n03 = self._n11 = None; self._n03_new = self._n11_new = False
+
+        # Rückgabe-Dict von snapshot(): einmal angelegt, je Runde überschrieben (Aufrufer liest synchron)
+        self._out = {"power_w": 0.0, "state": STATE_INVERT,
+                     "rssi": 0,               # v3: RSSI nicht verlässlich
+                     "pv_w": 0.0, "ac_v": 0.0, "dc_v": 0.0, "dc_i": 0.0, "ts": 0}
 
         # Takt/Backoff
         self._busy = False
         self._next_at = 0.0
         self._ok = 0; self._fail = 0; self._consec_fails = 0
         self._last_metrics_ts = 0.0
+        self._last_link_ts = 0.0   # letzte erfolgreiche Aktivität auf dem Link (Read/Keep-Alive)
+        self._warm_after = self.SUPERVISION_TIMEOUT_S / 2
         self._acc_read_ms = 0.0; self._acc_skew_ms = 0.0
 
         # Status
         self.last_status = "init"
         self.last_error = ""
         self.backend = "bluepy-v3"
-        self.addr_type = "public"  # v3 nutzte public fix
+        self.addr_type = _resolve_addrtype(addr_type or "")   # v3: public; random nur auf Vorgabe
 
-        if self.debug:
-            log_ble.debug("init: backend=%s mac=%s(src=%s) hci=%s addr=%s min=%.1fs backoff<=%.1fs",
+        if self._dbg:
+            self._log_debug("init: backend=%s mac=%s(src=%s) hci=%s addr=%s min=%.1fs backoff<=%.1fs",
                           self.backend, (self.mac or "<EMPTY>"), self._mac_src, self.hci, self.addr_type,
                           self.min_interval_s, self.backoff_max_s)
 
@@ -107,31 +189,65 @@ class BleOutbackClient:
         self._schedule_next(success=True)
 
     # Helper
+    def refresh_log_gate(self):
+        """Debug-Gate einmal bestimmen (Flag + Logger-Level); Levels ändern sich zur Laufzeit nicht."""
+        self._dbg = self.debug and log_ble.isEnabledFor(logging.DEBUG)
+        self._log_debug = log_ble.debug
+
     def _iface_index(self) -> int:
         try:
             return int(self.hci[3:]) if self.hci.startswith("hci") else 0
         except Exception:
             return 0
 
-    def _schedule_next(self, *, success: bool):
-        now = time.time()
+    def _schedule_next(self, *, success: bool, now: Optional[float] = None):
+        if now is None: now = _mono()
         if success:
             delay = self.min_interval_s; self._consec_fails = 0
         else:
-            ladder = [1.0, 2.0, 4.0, 8.0, 12.0]
-            idx = min(max(self._consec_fails-1, 0), len(ladder)-1)
-            delay = min(ladder[idx], self.backoff_max_s)
+            bo = self._bo
+            delay = bo[min(max(self._consec_fails-1, 0), len(bo)-1)]
         self._next_at = now + delay
 
     def _metrics(self):
-        now = time.time()
+        if not self._dbg: return   # Kennzahlen werden nur geloggt
+        now = _mono()
         if now - self._last_metrics_ts < 30.0: return
         self._last_metrics_ts = now
         avg_read = self._acc_read_ms/self._ok if self._ok else 0.0
+        # skew = Dauer des zweiten Reads: bluepy blockiert je Read → ≥ 1 Connection-Interval (Backend-abhängig)
         avg_skew = self._acc_skew_ms/self._ok if self._ok else 0.0
-        if self.debug:
-            log_ble.debug("v3: stats ok=%d fail=%d avg_read=%.1fms avg_skew=%.1fms next=%.2fs",
-                          self._ok, self._fail, avg_read, avg_skew, max(0.0, self._next_at - now))
+        self._log_debug("v3: stats ok=%d fail=%d avg_read=%.1fms avg_skew=%.1fms next=%.2fs",
+                        self._ok, self._fail, avg_read, avg_skew, max(0.0, self._next_at - now))
+
+    def _tune_conn_interval(self):
+        """Kurzes LE-Connection-Interval über debugfs vorgeben (gilt für neue Verbindungen; nur einmal).
+        Ohne debugfs/root still ignoriert. Reihenfolge min→max, da der Kernel min <= max prüft."""
+        if self._conn_tuned or not (self.conn_min_units and self.conn_max_units):
+            return
+        self._conn_tuned = True
+        for node, val in (("conn_min_interval", self.conn_min_units), ("conn_max_interval", self.conn_max_units)):
+            try:
+                with open(self._DEBUGFS % (self.hci, node), "w") as f:
+                    f.write(str(val))
+            except Exception as e:
+                if self._dbg: self._log_debug("v3: %s=%d not set (%s)", node, val, e)
+                return
+        if self._dbg:
+            self._log_debug("v3: conn interval %d..%d (x1.25ms)", self.conn_min_units, self.conn_max_units)
+
+    def _warm(self, now: float):
+        """Keep-Alive im Leerlauf: ein echter ATT-Read (A11, Ergebnis verworfen) erzeugt Verkehr auf dem Link,
+        bevor die Gegenstelle ihn wegen Leerlauf abbaut (kein teurer Reconnect)."""
+        if not self._connected or self._consec_fails or (now - self._last_link_ts) < self._warm_after:
+            return
+        try:
+            with _alarm(self.op_timeout_s):
+                self._rd(self._h11)
+            self._last_link_ts = _mono()
+        except Exception as e:
+            if self._dbg: self._log_debug("v3: keep-alive failed %s", e)
+            self._disconnect()
 
     # Connect/Disconnect – identisch zum v3-Verhalten
     def _connect(self):
@@ -140,96 +256,201 @@ class BleOutbackClient:
         if not self.mac:
             raise RuntimeError("keine BLE-MAC gesetzt (CLI --ble-mac oder ENV OUTBACK_BLE_MAC)")
         iface = self._iface_index()
-        if self.debug:
-            log_ble.debug("v3: connect mac=%s hci=%s addr=%s", self.mac, self.hci, self.addr_type)
+        self._tune_conn_interval()
+        if self._dbg:
+            self._log_debug("v3: connect mac=%s hci=%s addr=%s", self.mac, self.hci, self.addr_type)
         self._p = Peripheral(self.mac, iface=iface, addrType=self.addr_type)
-        s10 = self._p.getServiceByUUID(_SRV_1810)
-        s11 = self._p.getServiceByUUID(_SRV_1811)
-        self._c03 = s10.getCharacteristics(_A03)[0]
-        self._c11 = s11.getCharacteristics(_A11)[0]
+        self._connected = True
+        if self._hc:
+            # bekannte Handles → 4 Discovery-Roundtrips sparen; Prüfung erst bei Fehlschlag (snapshot)
+            self._h03, self._h11 = self._hc; self._hc_ok = False
+        else:
+            s10 = self._p.getServiceByUUID(_SRV_1810)
+            s11 = self._p.getServiceByUUID(_SRV_1811)
+            self._c03 = s10.getCharacteristics(_A03)[0]
+            self._c11 = s11.getCharacteristics(_A11)[0]
+            # Value-Handles + gebundene Read-Methode einmal je Verbindung auflösen.
+            # bluepy-helper kennt kein ATT Read-Multiple (0x0E) → zwei Reads direkt hintereinander.
+            self._h03 = self._c03.getHandle(); self._h11 = self._c11.getHandle()
+            self._hc = (self._h03, self._h11); self._hc_ok = True
+        self._rd = self._p.readCharacteristic
+        # bluepy-Peripheral hat i. d. R. kein getRSSI → einmal je Verbindung prüfen statt je Runde
+        self._getrssi = getattr(self._p, "getRSSI", None)
+        self._enable_notify()
         self._consec_fails = 0
+        self._last_link_ts = _mono()
         self.last_status = "connected"
         # v3 wartet nicht künstlich; wir bleiben identisch
 
     def _disconnect(self):
-        try:
-            if self._p: self._p.disconnect()
-        except Exception:
-            pass
-        self._p = self._c03 = self._c11 = None
+        if self._p is not None:
+            try:
+                self._p.disconnect()
+            except (BTLEException, OSError, ValueError):   # Helper/Pipe bereits weg
+                pass
+        self._connected = False
+        self._p = self._c03 = self._c11 = self._rd = self._getrssi = None
+        self._nt = False; self._n03_new = self._n11_new = False
         self.last_status = "disconnected"
-        if self.debug:
-            log_ble.debug("v3: disconnected")
+        if self._dbg:
+            self._log_debug("v3: disconnected")
+
+    def _cccd(self, c, h: int) -> Optional[int]:
+        """CCCD-Handle (0x2902) einer Characteristic per Descriptor-Discovery; ohne Characteristic-Objekt
+        (gecachte Handles) Suche ab Value-Handle bis zur nächsten Characteristic-Deklaration (0x2803)."""
+        if c is not None:
+            ds = c.getDescriptors(forUUID=0x2902)
+            return ds[0].handle if ds else None
+        for d in sorted(self._p.getDescriptors(h + 1, h + 4), key=lambda d: d.handle):
+            if d.uuid == 0x2803: break
+            if d.uuid == 0x2902: return d.handle
+        return None
+
+    def _enable_notify(self):
+        """Notify über die CCCDs beider Characteristics einschalten; _nt erst, wenn beide Writes gelangen.
+        Unterstützt das Gerät es nicht → dauerhaft Polling wie v3 (ein bereits aktiviertes CCCD wird zurückgesetzt)."""
+        self._nt = False
+        if not self.notify:
+            return
+        done = []; e = "no CCCD (0x2902)"
+        try:
+            cccds = (self._cccd(self._c03, self._h03), self._cccd(self._c11, self._h11))
+            if None not in cccds:
+                self._p.setDelegate(self)
+                for d in cccds:
+                    self._p.writeCharacteristic(d, b"\x01\x00", withResponse=True); done.append(d)
+                self._nt = True; return
+        except BTLEException as ex:
+            e = ex
+        for d in done:   # halb aktiviert → erstes CCCD wieder aus, sonst laufen ungenutzte Notifications auf
+            try:
+                self._p.writeCharacteristic(d, b"\x00\x00", withResponse=True)
+            except BTLEException:
+                pass
+        self.notify = False
+        if self._dbg: self._log_debug("v3: notify not available (%s) → polling", e)
+
+    def handleNotification(self, handle: int, data: bytes):
+        """bluepy-Delegate: jüngste A03/A11-Rohdaten zwischenspeichern (läuft innerhalb von bluepy-Aufrufen).
+        Frisch gilt nur, was im Drain der laufenden Runde ankam (Flags setzt snapshot() vor dem Drain zurück)."""
+        if handle == self._h03:
+            self._n03 = data; self._n03_new = True
+        elif handle == self._h11:
+            self._n11 = data; self._n11_new = True
+
+    def _drop_handle_cache(self):
+        """Gecachte Handles verwerfen, wenn sie auf dieser Verbindung nie eine gültige Runde lieferten."""
+        if self._hc and not self._hc_ok and self._connected:   # Connect-Fehler sagen nichts über Handles
+            if self._dbg: self._log_debug("v3: handle cache %s invalid → rediscover", self._hc)
+            self._hc = None
+            self._disconnect()
+
+    @property
+    def handles(self) -> Optional[Tuple[int, int]]:
+        """Aktuell bekannte Value-Handles (A03, A11) zum Persistieren oder None."""
+        return self._hc
 
     # Öffentliche API
     def snapshot(self) -> Optional[Dict]:
-        now = time.time()
+        now = _mono()   # Takt/Keep-Alive/Kennzahlen laufen monoton; Wanduhr nur für "ts"
         if now < self._next_at:
+            # Fast-Path: Methodenaufrufe nur, wenn Keep-Alive bzw. Kennzahlen tatsächlich fällig sind
             self.last_status = "throttle"
-            self._metrics()
+            if self._connected and (now - self._last_link_ts) >= self._warm_after:
+                self._warm(now)
+            if self._dbg and (now - self._last_metrics_ts) >= 30.0:
+                self._metrics()
             return None
         if self._busy:
             self.last_status = "busy"; return None
         self._busy = True
         try:
-            if not self._p:
-                self._connect()
-
-            t0 = time.monotonic()
-            raw_a03 = self._c03.read()
-            t_mid = time.monotonic()
-            raw_a11 = self._c11.read()
-            t1 = time.monotonic()
-
-            a03 = _swap_decode(raw_a03)
-            a11 = _swap_decode(raw_a11)
-
-            acV = a03[2]*0.1
-            acF = a03[3]*0.1
-            l1_power = float(a03[5])
-            dcV = a03[8]*0.01
-            dcI = float(a03[9])
-
-            pvV = a11[6]*0.1
-            pvP = float(a11[7])
-
-            self._ok += 1
+            with _alarm(self.op_timeout_s):   # Connect + beide Reads als eine Operation
+                if not self._connected:
+                    self._connect()
+
+                if self._nt:
+                    # gesamten Rückstau abholen, ohne zu blockieren; nur Frames aus diesem Drain zählen
+                    self._n03_new = self._n11_new = False
+                    wfn = self._p.waitForNotifications
+                    while wfn(0.0): pass
+                t0 = _mono()
+                if self._nt and self._n03_new and self._n11_new:
+                    raw_a03 = self._n03; raw_a11 = self._n11; t_mid = t1 = t0   # kein Read-Roundtrip
+                else:
+                    rd = self._rd
+                    raw_a03 = rd(self._h03)
+                    t_mid = _mono()
+                    raw_a11 = rd(self._h11)
+                    t1 = _mono()
+
+            r_acV, r_acF, r_l1, r_dcV, r_dcI = _A03_UNPACK(raw_a03)
+            r_pvV, r_pvP = _A11_UNPACK(raw_a11)
+
+            acV = r_acV*0.1
+            acF = r_acF*0.1
+            l1_power = float(r_l1)
+            dcV = r_dcV*0.01
+            dcI = float(r_dcI)
+
+            pvV = r_pvV*0.1
+            pvP = float(r_pvP)
+
+            self._ok += 1; self._hc_ok = True
+            self._last_link_ts = t1
             self._acc_read_ms += (t1 - t0) * 1000.0
             self._acc_skew_ms += (t1 - t_mid) * 1000.0
-            self._schedule_next(success=True)
+            self._schedule_next(success=True, now=t1)   # t1 = Rundenende, keine weitere Uhrabfrage
             self._metrics()
 
             self.last_status = "ok"; self.last_error = ""
-            if self.debug:
-                log_ble.debug("v3: round OK acV=%.1fV L1=%0.0fW pv=%0.0fW dc=%.2fV %+0.2fA",
+            if self._dbg:
+                self._log_debug("v3: round OK acV=%.1fV L1=%0.0fW pv=%0.0fW dc=%.2fV %+0.2fA",
                               acV, l1_power, pvP, dcV, dcI)
 
-            return {
-                "power_w": max(0.0, l1_power),
-                "state": STATE_INVERT,
-                "rssi": 0,               # v3: RSSI nicht verlässlich
-                "pv_w": max(0.0, pvP),
-                "ac_v": max(0.0, acV),
-                "dc_v": max(0.0, dcV),
-                "dc_i": dcI,
-                "ts": int(time.time())
-            }
+            out = self._out
+            out["power_w"] = max(0.0, l1_power)
+            out["pv_w"] = max(0.0, pvP)
+            out["ac_v"] = max(0.0, acV)
+            out["dc_v"] = max(0.0, dcV)
+            out["dc_i"] = dcI
+            if self._getrssi is not None and t1 >= self._rssi_next:
+                self._rssi_next = t1 + self.RSSI_REFRESH_S
+                try:
+                    out["rssi"] = int(self._getrssi() or 0)
+                except Exception:
+                    out["rssi"] = 0
+            out["ts"] = int(_wall())
+            return out
 
         except BTLEException as e:
             self._fail += 1; self._consec_fails += 1
             self.last_status = "btle_error"; self.last_error = str(e)
-            if self.debug: log_ble.debug("v3: FAIL %s", e)
-            try: self._disconnect()
-            except Exception: pass
+            hard = self._HARD_ERR_RE.search(self.last_error) is not None
+            if self._dbg: self._log_debug("v3: FAIL %s (hard=%s)", e, hard)
+            # Verbindung nur bei hartem Fehler, halbem Connect (Discovery fehlgeschlagen)
+            # oder anhaltenden weichen Fehlern verwerfen
+            if not hard: self._drop_handle_cache()
+            if self._connected and (hard or self._rd is None or self._consec_fails > self.SOFT_FAIL_RECONNECT):
+                self._disconnect()
+            self._schedule_next(success=False)
+            return None
+
+        except TimeoutError as e:
+            # SIGALRM-Operations-Timeout = harter Link-Fehler: neu verbinden, Handle-Cache bleibt (sagt nichts über Handles)
+            self._fail += 1; self._consec_fails += 1
+            self.last_status = "timeout"; self.last_error = str(e)
+            if self._dbg: self._log_debug("v3: FAIL timeout %s", e)
+            if self._connected: self._disconnect()
             self._schedule_next(success=False)
             return None
 
         except Exception as e:
             self._fail += 1; self._consec_fails += 1
             self.last_status = "error"; self.last_error = str(e)
-            if self.debug: log_ble.debug("v3: FAIL unexpected %s", e)
-            try: self._disconnect()
-            except Exception: pass
+            if self._dbg: self._log_debug("v3: FAIL unexpected %s", e)
+            self._drop_handle_cache()   # z. B. struct.error: falsches Handle liefert zu kurze Daten
+            if self._connected: self._disconnect()
             self._schedule_next(success=False)
             return None
 
@@ -237,7 +458,7 @@ class BleOutbackClient:
             self._busy = False
 
     def get_status(self) -> dict:
-        nxt = max(0.0, self._next_at - time.time())
+        nxt = max(0.0, self._next_at - _mono())
         return {
             "status": self.last_status,
             "error": self.last_error,
@@ -5,11 +5,16 @@ Lokal (Dry‑Run) werden minimalistische Stubs genutzt. Auf Venus OS
 werden automatisch die echten Klassen verwendet, falls verfügbar.
 """
 
+import math
 import os
-from typing import Any, Dict
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, NamedTuple, Optional
 import logging
 log_dbus = logging.getLogger("DBUS")
 
+_HELPER_NAME = os.path.basename(__file__)   # Platzhalter für /Mgmt/ProcessName bis _common_init überschreibt
+
 REAL_DBUS = False
 try:
     # Auf Venus OS vorhanden
@@ -41,8 +46,8 @@ def is_real_dbus() -> bool:
 
 def ensure_data_dir(path: str):
     try:
-        os.makedirs(path, exist_ok=True)
-    except Exception:
+        os.makedirs(path, exist_ok=True)   # existiert → kein Fehler
+    except OSError:   # z. B. ohne Schreibrecht im Dry-Run; Aufrufer fällt auf Defaults zurück
         pass
 
 
@@ -67,6 +72,12 @@ class _StubVeDbusService:
         return self.paths.get(path)
 
 
+# Toleranz, unterhalb derer float-Änderungen nicht publiziert werden
+FLOAT_REL_TOL = 1e-6
+FLOAT_ABS_TOL = 1e-3
+FORCE_PUSH_S = 30.0   # /UpdateIndex spätestens so oft erhöhen, auch wenn alle Werte im Totband blieben
+
+
 class VeDbusServiceWrapper:
     """
     Vereinheitlicht Zugriff auf echten VeDbusService und Stub.
@@ -77,14 +88,20 @@ class VeDbusServiceWrapper:
         self.name = name
         self.dry = dry or not REAL_DBUS
         self._bus = _get_system_bus()
+        self._update_index = 0   # lokaler /UpdateIndex-Zähler (kein get/set-Roundtrip je Publish)
+        self._deadband: Dict[str, float] = {}   # Pfad → absolutes Totband (sonst FLOAT_ABS_TOL)
+        self._pub_ts: Dict[str, float] = {}     # Pfad → letzte float-Publikation (monoton), für das Totband-Lebenszeichen
+        self._last_bump = 0.0
         if self.dry or self._bus is None or VeDbusService is None:
             self._svc = _StubVeDbusService(name)
+            # Stub wirft nie → schlanke Varianten ohne try/except direkt an die Instanz binden
+            self.set = self._set_stub; self.get = self._get_stub
         else:
             # Erst ohne auto-Register anlegen, damit wir zunächst Management-Pfade setzen können
             self._svc = VeDbusService(name, bus=self._bus, register=False)
         # Standard-Mgmt-Pfade hinzufügen; /Connected dann vom Aufrufer gesetzt
         try:
-            self.add("/Mgmt/ProcessName", os.path.basename(__file__))
+            self.add("/Mgmt/ProcessName", _HELPER_NAME)
             self.add("/Mgmt/ProcessVersion", "python")
         except Exception:
             pass
@@ -100,7 +117,10 @@ class VeDbusServiceWrapper:
             # Stub oder bereits registriert
             pass
 
-    def add(self, path: str, value=None):
+    def add(self, path: str, value=None, deadband: Optional[float] = None):
+        """deadband: float-Änderungen kleiner als dieser Abstand zum publizierten Wert nicht senden."""
+        if deadband is not None:
+            self._deadband[path] = deadband
         try:
             self._svc.add_path(path, value=value, writeable=True)
         except Exception:
@@ -108,14 +128,79 @@ class VeDbusServiceWrapper:
             if isinstance(self._svc, _StubVeDbusService):
                 self._svc.add_path(path, value=value, writeable=True)
 
-    def set(self, path: str, value):
+    def set(self, path: str, value) -> bool:
+        """Wert setzen; False, wenn er unverändert war (kein Signal)."""
+        return self._put(self._svc, path, value)
+
+    def _skip(self, path: str, cur, value) -> bool:
+        """True = nicht publizieren: gleicher Wert, oder float im Totband um den *publizierten* Wert
+        (langsam steigende Zähler laufen nicht weg). Exakt 0.0 geht immer raus, und im Totband
+        spätestens nach FORCE_PUSH_S – sonst klebt ein langsam abklingender Wert bis zu ein Totband daneben."""
+        if type(cur) is not type(value):
+            return False
+        if cur == value:
+            return True
+        if type(value) is not float or value == 0.0 or not math.isclose(
+                cur, value, rel_tol=FLOAT_REL_TOL, abs_tol=self._deadband.get(path, FLOAT_ABS_TOL)):
+            return False
+        return time.monotonic() - self._pub_ts.get(path, -FORCE_PUSH_S) < FORCE_PUSH_S
+
+    def _put(self, target, path: str, value) -> bool:
+        """Wie set(), schreibt aber über target (Service oder velib-ServiceContext eines Batches)."""
         try:
-            self._svc[path] = value
+            # unveränderte Werte nicht erneut publizieren (spart PropertiesChanged-IPC);
+            # Vergleich gegen den lokalen Service-Wert, damit externe Schreibzugriffe (GUI) erkannt bleiben.
+            if self._skip(path, self._svc[path], value):
+                return False
+            target[path] = value
+            if type(value) is float: self._pub_ts[path] = time.monotonic()
         except Exception:
             try:
                 self._svc.add_path(path, value=value, writeable=True)
             except Exception:
                 pass
+        return True
+
+    def _set_stub(self, path: str, value) -> bool:
+        paths = self._svc.paths
+        if self._skip(path, paths.get(path), value):
+            return False
+        paths[path] = value
+        if type(value) is float: self._pub_ts[path] = time.monotonic()
+        return True
+
+    def _get_stub(self, path: str, default=None):
+        return self._svc.paths.get(path, default)
+
+    def bump_update_index(self, put=None):
+        self._update_index = (self._update_index + 1) & 0xFF
+        (put or self.set)("/UpdateIndex", self._update_index)
+
+    def set_many(self, values: Dict[str, Any], bump_index: bool = False) -> bool:
+        """Mehrere Pfade auf einmal setzen (ein Signal statt eines je Pfad):
+        - velib mit dict_updates(): puffert Schreibzugriffe auf den Service, ein PropertiesChanged a{sv} beim Verlassen
+        - velib mit __enter__/__exit__: Schreibzugriffe über den gelieferten ServiceContext, ein ItemsChanged
+          beim Verlassen (direkte svc[path] = v würden je Pfad signalisieren)
+        - Stub/ältere velib: Einzel-Updates wie set()
+        bump_index: /UpdateIndex im selben Batch erhöhen, sofern sich etwas geändert hat
+        (oder als Lebenszeichen nach FORCE_PUSH_S)."""
+        du = getattr(self._svc, "dict_updates", None)
+        buffered = callable(du)
+        ctx = du() if buffered else (self._svc if hasattr(type(self._svc), "__enter__") else nullcontext())
+        changed = False
+        with ctx as c:
+            if buffered or c is None or c is self._svc:
+                put = self.set
+            else:
+                put = lambda path, value: self._put(c, path, value)
+            for path, value in values.items():
+                changed |= put(path, value)
+            if bump_index:
+                now = time.monotonic()
+                if changed or now - self._last_bump >= FORCE_PUSH_S:
+                    self._last_bump = now
+                    self.bump_update_index(put)
+        return changed
 
     def get(self, path: str, default=None):
         try:
@@ -129,6 +214,34 @@ class VeDbusServiceWrapper:
         return self._svc
 
 
+_MISSING = object()
+
+
+class TestSettings(NamedTuple):
+    """Test-Settings eines Ticks (einmal gelesen, dann Attributzugriffe). *_SET: Wert vorhanden und nicht None."""
+    L1: Any
+    L2: Any
+    L3: Any
+    PV_AC: Any
+    PV_DC: Any
+    GEN: Any
+    PV_AC_SET: bool
+    GEN_SET: bool
+    BATT_V: Optional[float]   # None → Batterie-Override übernimmt den bisherigen Wert
+    BATT_I: Optional[float]
+    BATT_P: Optional[float]
+    BATT_SOC: Optional[float]
+
+    @classmethod
+    def from_get(cls, g) -> "TestSettings":
+        pv = g("/Settings/Test/PV_AC", _MISSING); gen = g("/Settings/Test/GenPower", _MISSING)
+        return cls(g("/Settings/Test/L1", 400.0), g("/Settings/Test/L2", 0.0), g("/Settings/Test/L3", 0.0),
+                   300.0 if pv is _MISSING else pv, g("/Settings/Test/PV_DC", 0.0), 0.0 if gen is _MISSING else gen,
+                   pv is not _MISSING and pv is not None, gen is not _MISSING and gen is not None,
+                   g("/Settings/Test/Battery/Voltage", None), g("/Settings/Test/Battery/Current", None),
+                   g("/Settings/Test/Battery/Power", None), g("/Settings/Test/Battery/Soc", None))
+
+
 class SettingsStore:
     """
     Schlanker Settings-Ersatz (com.victronenergy.settings).
@@ -137,17 +250,75 @@ class SettingsStore:
     """
     def __init__(self, state_ref: Dict[str, Any]):
         self.state_ref = state_ref
-        self.state_ref.setdefault("settings", {})
+        # direkte Referenz auf das Settings-Dict: ein Lookup je get/set
+        self._s = self.state_ref.setdefault("settings", {})
 
     def ensure_defaults(self, defaults: Dict[str, Any]):
         for k, v in defaults.items():
-            self.state_ref["settings"].setdefault(k, v)
+            self._s.setdefault(k, v)
 
     def get(self, key: str, default=None):
-        return self.state_ref.get("settings", {}).get(key, default)
+        return self._s.get(key, default)
 
     def set(self, key: str, value: Any):
-        self.state_ref["settings"][key] = value
+        self._s[key] = value
+
+    def snapshot_test(self) -> TestSettings:
+        """Alle Test-Settings eines Ticks auf einmal."""
+        return TestSettings.from_get(self._s.get)
+
+class _ServiceNameCache:
+    """Bus-Namen einmal per ListNames, danach inkrementell über NameOwnerChanged (Signale brauchen die Mainloop)."""
+    def __init__(self):
+        self.names: set = set()
+        self._ready = False
+        self._listeners = []
+
+    def ensure(self) -> set:
+        if not self._ready and REAL_DBUS and dbus is not None:
+            bus = _get_system_bus()
+            if bus is not None:
+                try:
+                    self.names = {n for n in map(str, bus.list_names()) if not n.startswith(":")}   # einmal zu str, danach kein Umwandeln mehr
+                    bus.add_signal_receiver(self._on_owner, signal_name="NameOwnerChanged",
+                                            dbus_interface="org.freedesktop.DBus", bus_name="org.freedesktop.DBus")
+                    self._ready = True
+                except Exception:
+                    pass
+        return self.names
+
+    def subscribe(self, cb):
+        """cb(name, present) bei Erscheinen/Verschwinden eines wohlbekannten Namens."""
+        self._listeners.append(cb)
+
+    def _on_owner(self, name, old, new):
+        name = str(name)
+        if name.startswith(":"):
+            return
+        if new:
+            self.names.add(name)
+        else:
+            self.names.discard(name)
+        for cb in self._listeners:
+            try:
+                cb(name, bool(new))
+            except Exception:
+                log_dbus.debug("name listener failed for %s", name, exc_info=True)
+
+
+_NAMES = _ServiceNameCache()
+
+
+_BATT_PREFIX = "com.victronenergy.battery."
+class BattSample(NamedTuple):
+    """Batterie-Messwerte eines Ticks (Tupel → direkt entpackbar, kein Dict-Lookup je Feld)."""
+    V: float
+    I: float
+    P: float
+    SOC: float
+
+
+_BATT_PATHS = {"/Dc/0/Voltage": "V", "/Dc/0/Current": "I", "/Dc/0/Power": "P", "/Soc": "SOC"}
 
 # Am Dateiende (oder nach SettingsStore) hinzufügen:
 class BatteryDbusReader:
@@ -155,46 +326,96 @@ class BatteryDbusReader:
     Liest – falls verfügbar – den ersten com.victronenergy.battery.* Service:
     /Dc/0/Voltage, /Dc/0/Current, /Dc/0/Power, /Soc
     Rückgabe: {"V":float,"I":float,"P":float,"SOC":float} oder None.
+    Einmal GetItems (ein Roundtrip für alle Pfade), danach nur noch Signale → read() ohne D-Bus-Aufruf.
+    Ältere velib ohne GetItems: VeDbusItemImport je Pfad wie bisher.
+    Erscheint/verschwindet der BMS-Service später, wird über den Namens-Cache automatisch neu gebunden.
     """
     def __init__(self):
         self._bus = None
+        self._target = None
         self._paths = None
+        self._matches = []
+        self._vals: Dict[str, Any] = {}
         if REAL_DBUS and dbus is not None and VeDbusItemImport is not None:
             try:
                 # System-Bus
                 self._bus = dbus.SystemBus()
-                names = self._bus.list_names()
-                target = next((n for n in names if str(n).startswith("com.victronenergy.battery.")), None)
+                target = min((n for n in _NAMES.ensure() if n.startswith(_BATT_PREFIX)), default=None)
                 if target:
-                    self._paths = {
-                        "V": VeDbusItemImport(self._bus, target, "/Dc/0/Voltage"),
-                        "I": VeDbusItemImport(self._bus, target, "/Dc/0/Current"),
-                        "P": VeDbusItemImport(self._bus, target, "/Dc/0/Power"),
-                        "SOC": VeDbusItemImport(self._bus, target, "/Soc"),
-                    }
+                    self._bind(target)
+                _NAMES.subscribe(self._on_name)
             except Exception:
                 self._bus = None
                 self._paths = None
 
+    def _bind(self, target: str):
+        self._target = target
+        if not self._subscribe(target):
+            self._paths = {k: VeDbusItemImport(self._bus, target, p) for p, k in _BATT_PATHS.items()}
+
+    def _unbind(self):
+        for m in self._matches:
+            try:
+                m.remove()
+            except Exception:
+                pass
+        self._matches = []; self._vals = {}; self._paths = None; self._target = None
+
+    def _on_name(self, name: str, present: bool):
+        if not name.startswith(_BATT_PREFIX):
+            return
+        if not present and name == self._target:
+            self._unbind()
+            name = min((n for n in _NAMES.names if n.startswith(_BATT_PREFIX)), default=None)
+            present = name is not None
+        if present and self._target is None:
+            try:
+                self._bind(name)
+            except Exception:
+                self._unbind()
+
+    def _subscribe(self, target: str) -> bool:
+        try:
+            items = self._bus.get_object(target, "/").GetItems(dbus_interface="com.victronenergy.BusItem")
+        except Exception:
+            return False
+        for p, k in _BATT_PATHS.items():
+            if p in items:
+                self._vals[k] = items[p].get("Value")
+        self._matches = [
+            self._bus.add_signal_receiver(self._on_items, "ItemsChanged", "com.victronenergy.BusItem", target, "/"),
+            self._bus.add_signal_receiver(self._on_prop, "PropertiesChanged", "com.victronenergy.BusItem", target,
+                                          path_keyword="path"),
+        ]
+        return True
+
+    def _on_items(self, items):
+        for p, ch in items.items():
+            k = _BATT_PATHS.get(str(p))
+            if k is not None and "Value" in ch:
+                self._vals[k] = ch["Value"]
+
+    def _on_prop(self, changes, path=None):
+        k = _BATT_PATHS.get(str(path))
+        if k is not None and "Value" in changes:
+            self._vals[k] = changes["Value"]
+
     def read(self):
-        if not self._paths:
-            return None
         try:
-            v = float(self._paths["V"].get_value())
-            i = float(self._paths["I"].get_value())
-            p = float(self._paths["P"].get_value())
-            soc = float(self._paths["SOC"].get_value())
-            return {"V": v, "I": i, "P": p, "SOC": soc}
+            if self._paths:
+                p = self._paths
+                return BattSample(float(p["V"].get_value()), float(p["I"].get_value()),
+                                  float(p["P"].get_value()), float(p["SOC"].get_value()))
+            if len(self._vals) == 4:
+                v = self._vals
+                return BattSample(float(v["V"]), float(v["I"]), float(v["P"]), float(v["SOC"]))
         except Exception:
-            return None
+            pass
+        return None
 
 
 def list_system_services_prefix(prefix: str = "com.victronenergy.") -> list:
+    """Aus dem Namens-Cache (kein ListNames-Roundtrip je Aufruf)."""
     if not REAL_DBUS or dbus is None:
         return []
-    try:
-        bus = _get_system_bus()
-        names = bus.list_names()
-        return [n for n in names if str(n).startswith(prefix)]
-    except Exception:
-        return []
+    return [n for n in _NAMES.ensure() if n.startswith(prefix)]
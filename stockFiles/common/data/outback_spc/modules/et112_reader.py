@@ -6,6 +6,8 @@ ET112-Reader (Stub):
 """
 
 class Et112Reader:
+    blocking = False   # Stub ohne I/O; echte Modbus-Anbindung → True (Hintergrund-Poller)
+
     def __init__(self, source_hint: str = ""):
         self.hint = source_hint
 
@@ -7,16 +7,19 @@ Kleines Logging-Framework:
 - periodische Summenzeile
 """
 
+import json
 import logging
 import sys
 import time
 from dataclasses import dataclass
 
-_START = time.monotonic()
+_mono_ns = time.monotonic_ns
+_json_dumps = json.dumps
+_START_NS = _mono_ns()
 
 
 def _elapsed():
-    return time.monotonic() - _START
+    return (_mono_ns() - _START_NS) / 1e9
 
 
 _LEVELS = {
@@ -31,17 +34,19 @@ _LEVELS = {
 class RateLimiter:
     def __init__(self, ms: int = 500):
         self.ms = ms
-        self._last_msg = None
-        self._last_t = 0.0
+        self._ms_ns = int(ms * 1_000_000)   # ganzzahlig in ns vergleichen (kein Float je Aufruf)
+        self._last_hash: int = 0   # Hash statt voller Nachricht: ein Int-Vergleich, Kollision kostet höchstens eine Zeile
+        self._last_t_ns: int = 0
 
     def allow(self, msg: str) -> bool:
-        now = time.monotonic()
-        if msg != self._last_msg:
-            self._last_msg = msg
-            self._last_t = now
+        now = _mono_ns()
+        h = hash(msg)
+        if h != self._last_hash:
+            self._last_hash = h
+            self._last_t_ns = now
             return True
-        if (now - self._last_t) * 1000.0 >= self.ms:
-            self._last_t = now
+        if now - self._last_t_ns >= self._ms_ns:
+            self._last_t_ns = now
             return True
         return False
 
@@ -52,20 +57,27 @@ class LoggerX:
         self.level = _LEVELS.get(level.upper(), logging.INFO)
         self.fmt = fmt
         self.rl = RateLimiter(rate_limit_ms)
+        self._module = self.tag.strip()
+        self._text_fmt = "[T+%.3fs] " + self.tag.replace("%", "%%") + " %-5s %s\n"   # Tag einmal eingebettet
 
     def _emit(self, lvl_name: str, text: str):
+        # billige Prüfungen (Level, Ratenlimit) vor Zeitstempel und Formatierung
         if _LEVELS.get(lvl_name, 999) < self.level:
             return
         if not self.rl.allow(f"{lvl_name}:{text}"):
             return
         t = _elapsed()
+        out = sys.stdout   # einmal nachschlagen; nicht modulweit binden, damit Umleitungen von stdout greifen
         if self.fmt == "json":
-            import json
-            obj = {"t_rel_s": round(t, 3), "module": self.tag.strip(), "level": lvl_name, "text": text}
-            sys.stdout.write(json.dumps(obj, separators=(",", ":")) + "\n")
+            obj = {"t_rel_s": round(t, 3), "module": self._module, "level": lvl_name, "text": text}
+            out.write(_json_dumps(obj, separators=(",", ":")) + "\n")
         else:
-            sys.stdout.write(f"[T+{t:.3f}s] {self.tag} {lvl_name:<5} {text}\n")
-        sys.stdout.flush()
+            out.write(self._text_fmt % (t, lvl_name, text))
+        out.flush()
+
+    def enabled(self, lvl_name: str = "INFO") -> bool:
+        """Level-Gate vor dem Formatieren teurer Texte (Ratenlimit braucht den fertigen Text)."""
+        return _LEVELS.get(lvl_name, 999) >= self.level
 
     def debug(self, text: str): self._emit("DEBUG", text)
     def info(self, text: str): self._emit("INFO", text)
@@ -82,12 +94,15 @@ def make_logger(tag: str, level: str = "INFO", fmt: str = "text", rate_limit_ms:
 class Summary:
     """Einfache periodische Summenzeilen-Ausgabe."""
     period_s: int = 5
-    _last: float = 0.0
+    _last_ns: int = 0
+
+    def __post_init__(self):
+        self._period_ns = int(self.period_s * 1_000_000_000)
 
     def due(self) -> bool:
-        now = time.monotonic()
-        if now - self._last >= self.period_s:
-            self._last = now
+        now = _mono_ns()
+        if now - self._last_ns >= self._period_ns:
+            self._last_ns = now
             return True
         return False
 
@@ -15,8 +15,16 @@ from typing import Any
 
 from .dbus_helpers import VeDbusServiceWrapper
 
+# Totbänder je Größe (Abstand zum publizierten Wert); Energie behält 1-Wh-Auflösung
+DB_POWER_W = 1.0
+DB_VOLTAGE_V = 0.5
+DB_CURRENT_A = 0.05
+DB_ENERGY_KWH = 0.001
+
 log = logging.getLogger("services")
 
+_PROCESS_NAME = os.path.basename(sys.argv[0])   # je Prozess konstant
+
 
 def _common_init(svc: VeDbusServiceWrapper, device_instance: int, product_name: str, product_id: int, fw: str):
     """Standard- und Management-Keys setzen."""
@@ -25,34 +33,31 @@ def _common_init(svc: VeDbusServiceWrapper, device_instance: int, product_name:
     svc.add("/ProductId", int(product_id))
     svc.add("/FirmwareVersion", str(fw))
     svc.add("/Connected", 1)
-    svc.add("/Mgmt/ProcessName", os.path.basename(sys.argv[0]))
+    svc.add("/Mgmt/ProcessName", _PROCESS_NAME)
     svc.add("/Mgmt/ProcessVersion", str(fw))
     svc.add("/Info/TestMode", 0)
     svc.add("/UpdateIndex", 0)
     log.debug("common init: product=%s di=%d", product_name, device_instance)
 
 
-def _bump_update_index(svc: VeDbusServiceWrapper):
-    try:
-        cur = int(svc.get("/UpdateIndex", 0))
-        log.debug("update-index: current=%d", cur)
-        svc.set("/UpdateIndex", (cur + 1) % 256)
-        log.debug("update-index: new=%d", (cur + 1) % 256)
-    except Exception:
-        log.warning("update-index: fallback reset to 1")
-        svc.set("/UpdateIndex", 1)
+class _ServiceBase:
+    """Gemeinsame Methoden der vier Services (eine Definition statt vier Kopien)."""
+    svc: VeDbusServiceWrapper
+
+    def set_test_mode(self, on: int):
+        self.svc.set_many({"/Info/TestMode": int(on)}, bump_index=True)
 
 
-class InverterOutbackService:
+class InverterOutbackService(_ServiceBase):
     """com.victronenergy.inverter.outback_l1 – reine AC-Abgabe + State"""
 
     def __init__(self, name: str, device_instance: int, fw: str, dry: bool, power_limit: int):
         log.info("Registering service '%s' (INV) di=%d fw=%s dry=%s limit=%d", name, device_instance, fw, dry, power_limit)
         self.svc = VeDbusServiceWrapper(name, dry=dry, register=False)
         _common_init(self.svc, device_instance, "Outback SPC III (L1)", 0xA001, fw)
-        self.svc.add("/Ac/Out/L1/Voltage", 0.0)
-        self.svc.add("/Ac/Out/L1/Current", 0.0)
-        self.svc.add("/Ac/Out/L1/Power", 0.0)
+        self.svc.add("/Ac/Out/L1/Voltage", 0.0, deadband=DB_VOLTAGE_V)
+        self.svc.add("/Ac/Out/L1/Current", 0.0, deadband=DB_CURRENT_A)
+        self.svc.add("/Ac/Out/L1/Power", 0.0, deadband=DB_POWER_W)
         self.svc.add("/Ac/Out/L1/PowerLimit", int(power_limit))
         self.svc.add("/State", 0)  # 0=Off, 1=Invert, 2=Charge, 3=Passthrough
         self.svc.add("/Info/LastBleUpdate", 0)
@@ -61,30 +66,27 @@ class InverterOutbackService:
         log.info("Service '%s' registered successfully.", name)
 
     def update(self, voltage: float, current: float, power: float, state: int, last_ble_update: int, rssi: int):
-        self.svc.set("/Ac/Out/L1/Voltage", float(voltage))
-        self.svc.set("/Ac/Out/L1/Current", float(current))
-        self.svc.set("/Ac/Out/L1/Power", float(power))
-        self.svc.set("/State", int(state))
-        self.svc.set("/Info/LastBleUpdate", int(last_ble_update))
-        self.svc.set("/Info/Rssi", int(rssi))
-        _bump_update_index(self.svc)
-
-    def set_test_mode(self, on: int):
-        self.svc.set("/Info/TestMode", int(on))
-        _bump_update_index(self.svc)
+        self.svc.set_many({
+            "/Ac/Out/L1/Voltage": float(voltage),
+            "/Ac/Out/L1/Current": float(current),
+            "/Ac/Out/L1/Power": float(power),
+            "/State": int(state),
+            "/Info/LastBleUpdate": int(last_ble_update),
+            "/Info/Rssi": int(rssi),
+        }, bump_index=True)
 
 
-class PVInverterService:
+class PVInverterService(_ServiceBase):
     """com.victronenergy.pvinverter.outback_l1 – AC-PV Anteil auf L1 (niemals flappen)."""
 
     def __init__(self, name: str, device_instance: int, fw: str, dry: bool, power_limit: int):
         log.info("Registering service '%s' (PV) di=%d fw=%s dry=%s limit=%d", name, device_instance, fw, dry, power_limit)
         self.svc = VeDbusServiceWrapper(name, dry=dry, register=False)
         _common_init(self.svc, device_instance, "AC-PV (Outback L1)", 0xA002, fw)
-        self.svc.add("/Ac/L1/Power", 0.0)
-        self.svc.add("/Ac/L1/Energy/Forward", 0.0)  # kWh
-        self.svc.add("/Ac/Power", 0.0)
-        self.svc.add("/Ac/Energy/Forward", 0.0)
+        self.svc.add("/Ac/L1/Power", 0.0, deadband=DB_POWER_W)
+        self.svc.add("/Ac/L1/Energy/Forward", 0.0, deadband=DB_ENERGY_KWH)  # kWh
+        self.svc.add("/Ac/Power", 0.0, deadband=DB_POWER_W)
+        self.svc.add("/Ac/Energy/Forward", 0.0, deadband=DB_ENERGY_KWH)
         self.svc.add("/Ac/Out/L1/PowerLimit", int(power_limit))
         self.svc.add("/Position", 1)  # 1 = AC-Out
         self.svc.set("/Connected", 1)
@@ -92,70 +94,64 @@ class PVInverterService:
         log.info("Service '%s' registered successfully.", name)
 
     def update(self, power: float, forward_kwh: float):
-        p = float(max(0.0, power))
-        self.svc.set("/Ac/L1/Power", p)
-        self.svc.set("/Ac/Power", p)
-        self.svc.set("/Ac/L1/Energy/Forward", float(forward_kwh))
-        self.svc.set("/Ac/Energy/Forward", float(forward_kwh))
-        _bump_update_index(self.svc)
-
-    def set_test_mode(self, on: int):
-        self.svc.set("/Info/TestMode", int(on))
-        _bump_update_index(self.svc)
+        p = float(power) if power > 0.0 else 0.0; e = float(forward_kwh)   # bedingt statt max()-Aufruf
+        self.svc.set_many({
+            "/Ac/L1/Power": p,
+            "/Ac/Power": p,
+            "/Ac/L1/Energy/Forward": e,
+            "/Ac/Energy/Forward": e,
+        }, bump_index=True)
 
 
-class GridGeneratorService:
+class GridGeneratorService(_ServiceBase):
     """com.victronenergy.grid.generator_tuya – Generator/AC-In (nur bei Passthrough aktiv)."""
 
     def __init__(self, name: str, device_instance: int, fw: str, dry: bool, power_limit: int):
         log.info("Registering service '%s' (GEN) di=%d fw=%s dry=%s limit=%d", name, device_instance, fw, dry, power_limit)
         self.svc = VeDbusServiceWrapper(name, dry=dry, register=False)
         _common_init(self.svc, device_instance, "Generator via Tuya", 0xA003, fw)
-        self.svc.add("/Ac/L1/Voltage", 0.0)
-        self.svc.add("/Ac/L1/Current", 0.0)
-        self.svc.add("/Ac/L1/Power", 0.0)
+        self.svc.add("/Ac/L1/Voltage", 0.0, deadband=DB_VOLTAGE_V)
+        self.svc.add("/Ac/L1/Current", 0.0, deadband=DB_CURRENT_A)
+        self.svc.add("/Ac/L1/Power", 0.0, deadband=DB_POWER_W)
         self.svc.add("/Status/Running", 0)
         self.svc.add("/Ac/Out/L1/PowerLimit", int(power_limit))
         self.svc.register()
         log.info("Service '%s' registered successfully.", name)
 
     def update(self, voltage: float, current: float, power: float, running: int):
-        self.svc.set("/Ac/L1/Voltage", float(voltage))
-        self.svc.set("/Ac/L1/Current", float(current))
-        self.svc.set("/Ac/L1/Power", float(power))
-        self.svc.set("/Status/Running", int(running))
-        _bump_update_index(self.svc)
-
-    def set_test_mode(self, on: int):
-        self.svc.set("/Info/TestMode", int(on))
-        _bump_update_index(self.svc)
+        self.svc.set_many({
+            "/Ac/L1/Voltage": float(voltage),
+            "/Ac/L1/Current": float(current),
+            "/Ac/L1/Power": float(power),
+            "/Status/Running": int(running),
+        }, bump_index=True)
 
 
-class AcMeterService:
+class AcMeterService(_ServiceBase):
     """com.victronenergy.acmeter.et112_{L2|L3} – getrennte Abgaben, inkl. Forward-Zähler."""
 
     def __init__(self, name: str, device_instance: int, phase: str, fw: str, dry: bool, power_limit: int):
         assert phase in ("L2", "L3")
         log.info("Registering service '%s' (ACM %s) di=%d fw=%s dry=%s limit=%d", name, phase, device_instance, fw, dry, power_limit)
         self.phase = phase
+        # Pfade je Phase einmal bauen (interniert, da Dict-Keys im Hot-Path)
+        self._p_v = sys.intern(f"/Ac/Out/{phase}/Voltage"); self._p_i = sys.intern(f"/Ac/Out/{phase}/Current")
+        self._p_p = sys.intern(f"/Ac/Out/{phase}/Power"); self._p_lim = sys.intern(f"/Ac/Out/{phase}/PowerLimit")
         self.svc = VeDbusServiceWrapper(name, dry=dry, register=False)
         _common_init(self.svc, device_instance, f"ET112 ({phase})", 0xA004, fw)
-        self.svc.add(f"/Ac/Out/{phase}/Voltage", 0.0)
-        self.svc.add(f"/Ac/Out/{phase}/Current", 0.0)
-        self.svc.add(f"/Ac/Out/{phase}/Power", 0.0)
-        self.svc.add("/Ac/Energy/Forward", 0.0)
-        self.svc.add(f"/Ac/Out/{phase}/PowerLimit", int(power_limit))
+        self.svc.add(self._p_v, 0.0, deadband=DB_VOLTAGE_V)
+        self.svc.add(self._p_i, 0.0, deadband=DB_CURRENT_A)
+        self.svc.add(self._p_p, 0.0, deadband=DB_POWER_W)
+        self.svc.add("/Ac/Energy/Forward", 0.0, deadband=DB_ENERGY_KWH)
+        self.svc.add(self._p_lim, int(power_limit))
         self.svc.register()
         log.info("Service '%s' registered successfully.", name)
 
     def update(self, power: float, voltage: float, current: float, forward_kwh: float):
-        p = float(max(0.0, power))
-        self.svc.set(f"/Ac/Out/{self.phase}/Voltage", float(voltage))
-        self.svc.set(f"/Ac/Out/{self.phase}/Current", float(current))
-        self.svc.set(f"/Ac/Out/{self.phase}/Power", p)
-        self.svc.set("/Ac/Energy/Forward", float(forward_kwh))
-        _bump_update_index(self.svc)
-
-    def set_test_mode(self, on: int):
-        self.svc.set("/Info/TestMode", int(on))
-        _bump_update_index(self.svc)
+        p = float(power) if power > 0.0 else 0.0   # bedingt statt max()-Aufruf
+        self.svc.set_many({
+            self._p_v: float(voltage),
+            self._p_i: float(current),
+            self._p_p: p,
+            "/Ac/Energy/Forward": float(forward_kwh),
+        }, bump_index=True)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Append-Journal für die Forward-Zähler (state.json.log):
+- je Änderung ein fester Datensatz (seq, pv, l2, l3, Datum, CRC32) per O_APPEND – ein os.write, kein JSON
+- state.json (Snapshot) merkt sich "journal_seq"; beim Laden gewinnt der letzte gültige
+  Datensatz mit größerer seq (absolute Zählerstände → Replay idempotent)
+- Replay endet am ersten kaputten Datensatz; open() kürzt die Datei dorthin (Raster bleibt erhalten)
+- nach jedem Snapshot wird das Journal geleert, sofern seitdem nichts angehängt wurde
+"""
+
+import logging
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict
+
+log = logging.getLogger("STATE")
+
+_BODY = struct.Struct("<I3d10s")   # seq, pv_kwh, l2_kwh, l3_kwh, ISO-Datum → 38 Bytes
+_CRC = struct.Struct("<I")
+_REC_SIZE = _BODY.size + _CRC.size   # 42 Bytes je Datensatz
+
+
+class StateJournal:
+    def __init__(self, path: str):
+        self.path = path
+        self.seq = 0
+        self._fd = None
+        self._size = None   # Ende des letzten gültigen Datensatzes (None: Datei nicht geprüft)
+        self._lock = threading.Lock()   # append (Hauptschleife) vs. truncate (Writer-Thread)
+
+    def replay(self, state: Dict[str, Any]) -> bool:
+        """Neuesten Journal-Stand nach dem Snapshot in state übernehmen; True, falls etwas nachgespielt wurde."""
+        self.seq = int(state.get("journal_seq", 0) or 0)
+        self._size = 0
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            self._size = None   # nicht gelesen → open() kürzt nichts
+            log.warning("journal replay failed: %s", e)
+            return False
+        last = None
+        for off in range(0, len(data) - _REC_SIZE + 1, _REC_SIZE):   # abgeschnittener Rest (Stromausfall) fällt weg
+            body = data[off:off + _BODY.size]
+            if _CRC.unpack_from(data, off + _BODY.size)[0] != zlib.crc32(body):
+                log.warning("journal: ungültiger Datensatz bei Offset %d – Rest verworfen", off)
+                break
+            self._size = off + _REC_SIZE
+            rec = _BODY.unpack(body)
+            if rec[0] > self.seq:
+                self.seq = rec[0]; last = rec
+        if last is None:
+            return False
+        _, state["pv_forward_kwh"], state["l2_forward_kwh"], state["l3_forward_kwh"], ymd = last
+        state["last_reset_ymd"] = ymd.rstrip(b"\0").decode("ascii", "replace")
+        return True
+
+    def open(self):
+        """Nach replay(): torn tail/kaputten Rest abschneiden, damit neue Datensätze im Raster liegen."""
+        try:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            size = os.fstat(self._fd).st_size
+            if self._size is None:   # ohne replay: wenigstens aufs Datensatzraster kürzen
+                self._size = size - size % _REC_SIZE
+            if size != self._size:
+                os.ftruncate(self._fd, self._size)
+        except OSError as e:
+            self._fd = None
+            log.warning("journal open failed: %s", e)
+
+    def append(self, pv_kwh: float, l2_kwh: float, l3_kwh: float, ymd: str) -> int:
+        with self._lock:
+            self.seq += 1
+            if self._fd is not None:
+                body = _BODY.pack(self.seq, pv_kwh, l2_kwh, l3_kwh, ymd.encode("ascii", "replace"))
+                try:
+                    n = os.write(self._fd, body + _CRC.pack(zlib.crc32(body)))
+                    if n == _REC_SIZE:
+                        self._size += n
+                        return self.seq
+                    log.warning("journal append: nur %d von %d Bytes geschrieben", n, _REC_SIZE)
+                except OSError as e:
+                    log.warning("journal append failed: %s", e)
+                try:   # Teilstück entfernen, sonst verrutscht das Raster aller Folgedatensätze
+                    os.ftruncate(self._fd, self._size)
+                except OSError:
+                    pass
+            return self.seq
+
+    def truncate_upto(self, seq: int):
+        """Nach erfolgreichem Snapshot mit journal_seq=seq: leeren, falls seitdem nichts dazukam."""
+        with self._lock:
+            if self._fd is not None and self.seq == seq:
+                try:
+                    os.ftruncate(self._fd, 0)
+                    self._size = 0
+                except OSError as e:
+                    log.warning("journal truncate failed: %s", e)
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
@@ -6,8 +6,6 @@ Kernlogik:
 - EMA‑Glättung & Hilfen
 """
 
-from dataclasses import dataclass
-
 
 # Outback-/Inverter-States (Enum)
 STATE_OFF = 0
@@ -16,60 +14,114 @@ STATE_CHARGE = 2
 STATE_PASSTHROUGH = 3
 
 
+# Numba (optional): Kernformeln nativ kompiliert; ohne Numba reines Python
+try:
+    from numba import njit  # type: ignore
+except Exception:
+    def njit(*_args, **_kwargs):
+        return lambda f: f
+
+# Systemzustände als Codes (njit-tauglich), Namen nur fürs Logging/API
+SYS_GEN_PASSTHROUGH, SYS_NIGHT_BATT, SYS_DAY_PV_DIRECT, SYS_DAY_PV_SURPLUS, SYS_DAY_PV_PLUS_BATT = 0, 1, 2, 3, 4
+STATE_NAMES = ("GEN_PASSTHROUGH", "NIGHT_BATT", "DAY_PV_DIRECT", "DAY_PV_SURPLUS", "DAY_PV_PLUS_BATT")
+
+
 def clamp(x, lo, hi):
     return max(lo, min(hi, x))
 
 
+@njit(cache=True, fastmath=True)
 def compute_pv_ac(P_L1_out: float, P_batt: float) -> float:
     """
     Zentrale Formel gegen Doppelzählungen:
     P_pv_ac = clamp( P_L1_out - max(0, -P_batt), 0, P_L1_out )
     Hinweis: P_batt > 0 = Laden (Energie in Batterie), P_batt < 0 = Entladen.
     """
-    return clamp(P_L1_out - max(0.0, -P_batt), 0.0, P_L1_out)
+    # clamp als bedingte Ausdrücke (gleiche Semantik wie max/min, ohne Builtin-Aufrufe; njit-tauglich)
+    d = -P_batt
+    x = P_L1_out - (d if d > 0.0 else 0.0)
+    x = x if x < P_L1_out else P_L1_out
+    return x if x > 0.0 else 0.0
 
 
-def classify_state(pv_ac: float, l1_out: float, batt_p: float, outback_state: int, gen_power: float, eps: float = 50.0) -> str:
-    """
-    State-Machine mit Hysterese (eps):
-    - DAY_PV_DIRECT: PV deckt L1 (Batterie ~0)
-    - DAY_PV_PLUS_BATT: PV reicht nicht, Batterie liefert
-    - DAY_PV_SURPLUS: PV > L1 (DC-Laden nur via MPPT, hier nicht gemeldet)
-    - NIGHT_BATT: PV≈0, Batterie versorgt
-    - GEN_PASSTHROUGH: Outback Passthrough + Generatorleistung über Schwelle
-    """
+@njit(cache=True, fastmath=True)
+def classify_state_code(pv_ac: float, l1_out: float, batt_p: float, outback_state: int, gen_power: float, eps: float = 50.0) -> int:
+    """Wie classify_state, liefert aber den Code (SYS_*) statt des Namens."""
     # Generator vorziehen
     if outback_state == STATE_PASSTHROUGH and gen_power > eps:
-        return "GEN_PASSTHROUGH"
+        return SYS_GEN_PASSTHROUGH
 
     if pv_ac <= eps and l1_out > eps:
         # Nachtfall: keine AC-PV, Last > 0
-        return "NIGHT_BATT"
+        return SYS_NIGHT_BATT
 
     # Tagfälle
     diff = pv_ac - l1_out
     if abs(batt_p) <= eps and abs(diff) <= eps:
-        return "DAY_PV_DIRECT"
+        return SYS_DAY_PV_DIRECT
     if diff >= eps:
-        return "DAY_PV_SURPLUS"
+        return SYS_DAY_PV_SURPLUS
     if diff <= -eps and batt_p < -eps:
-        return "DAY_PV_PLUS_BATT"
+        return SYS_DAY_PV_PLUS_BATT
 
     # Fallback
     if pv_ac > eps:
-        return "DAY_PV_DIRECT"
-    return "NIGHT_BATT"
+        return SYS_DAY_PV_DIRECT
+    return SYS_NIGHT_BATT
+
+
+def classify_state(pv_ac: float, l1_out: float, batt_p: float, outback_state: int, gen_power: float, eps: float = 50.0) -> str:
+    """
+    State-Machine mit Hysterese (eps):
+    - DAY_PV_DIRECT: PV deckt L1 (Batterie ~0)
+    - DAY_PV_PLUS_BATT: PV reicht nicht, Batterie liefert
+    - DAY_PV_SURPLUS: PV > L1 (DC-Laden nur via MPPT, hier nicht gemeldet)
+    - NIGHT_BATT: PV≈0, Batterie versorgt
+    - GEN_PASSTHROUGH: Outback Passthrough + Generatorleistung über Schwelle
+    """
+    return STATE_NAMES[classify_state_code(float(pv_ac), float(l1_out), float(batt_p), int(outback_state), float(gen_power), float(eps))]
 
 
-@dataclass
 class EMA:
-    """Einfache Exponential Moving Average (α≈0,3)."""
-    alpha: float = 0.3
-    _y: float = None
-
-    def update(self, x: float) -> float:
-        if self._y is None:
-            self._y = x
-        else:
-            self._y = self.alpha * x + (1.0 - self.alpha) * self._y
-        return self._y
+    """Einfache Exponential Moving Average (α≈0,3). Warmstart über _y möglich.
+    Rekursion y += α·(x − y): gleiche Übertragungsfunktion wie α·x + (1−α)·y, ein Produkt weniger."""
+    __slots__ = ("alpha", "_y", "update")
+
+    def __init__(self, alpha: float = 0.3, _y: float = None):
+        self.alpha = alpha
+        self._y = _y
+        # erster Aufruf übernimmt den Startwert, danach direkt _step (kein None-Test je Update)
+        self.update = self._first if _y is None else self._step
+
+    def __repr__(self):
+        return f"EMA(alpha={self.alpha!r}, _y={self._y!r})"
+
+    def _first(self, x: float) -> float:
+        self._y = x
+        self.update = self._step
+        return x
+
+    def _step(self, x: float) -> float:
+        y = self._y
+        self._y = y = y + self.alpha * (x - y)
+        return y
+
+
+class EMAVec:
+    """Mehrere EMAs mit gleichem α in einem Aufruf (ein Update je Tick statt je Kanal)."""
+    __slots__ = ("alpha", "_y", "update")
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self._y = None
+        self.update = self._first
+
+    def _first(self, xs) -> tuple:
+        self._y = y = tuple(xs)
+        self.update = self._step
+        return y
+
+    def _step(self, xs) -> tuple:
+        a = self.alpha
+        self._y = y = tuple([v + a * (x - v) for x, v in zip(xs, self._y)])
+        return y
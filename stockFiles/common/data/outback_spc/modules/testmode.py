@@ -9,6 +9,18 @@ import time
 from typing import Dict, Any
 
 from .state_machine import STATE_INVERT, STATE_PASSTHROUGH, compute_pv_ac, clamp
+from .dbus_helpers import BattSample, TestSettings
+
+# Szenario-Tabelle: (L1-Default falls None, PV_AC, PV-Regel, GEN, GEN-Regel); "off" fehlt → Settings unverändert
+_FIX, _IF_UNSET, _IF_NONE, _FROM_L1, _KEEP = range(5)   # Wert fest | nur wenn nicht gesetzt | nur wenn None | = L1 | unverändert
+_SCENARIO_TABLE = {
+    "night":         (400.0,  0.0,   _FIX,      0.0,    _FIX),
+    "day":           (500.0,  None,  _FROM_L1,  0.0,    _FIX),
+    "day_plus_batt": (800.0,  500.0, _IF_UNSET, 0.0,    _FIX),
+    "day_surplus":   (300.0,  600.0, _IF_UNSET, 0.0,    _FIX),
+    "gen":           (1600.0, 500.0, _IF_UNSET, 1200.0, _IF_UNSET),
+    "custom":        (900.0,  620.0, _IF_NONE,  None,   _KEEP),
+}
 
 
 class TestMode:
@@ -38,58 +50,40 @@ class TestMode:
         self.power = batt_p
         self.current = batt_p / max(1.0, self.voltage)
 
-    def _scenario_values(self) -> Dict[str, float]:
-        L1 = self.settings.get("/Settings/Test/L1", 400.0)
-        L2 = self.settings.get("/Settings/Test/L2", 0.0)
-        L3 = self.settings.get("/Settings/Test/L3", 0.0)
-        PV_AC = self.settings.get("/Settings/Test/PV_AC", 300.0)
-        PV_DC = self.settings.get("/Settings/Test/PV_DC", 0.0)
-        GEN = self.settings.get("/Settings/Test/GenPower", 0.0)
-
-        sc = self.scenario
-        if sc == "night":
-            L1 = 400.0 if L1 is None else L1
-            PV_AC = 0.0
-            GEN = 0.0
-        elif sc == "day":
-            L1 = 500.0 if L1 is None else L1
-            PV_AC = L1
-            GEN = 0.0
-        elif sc == "day_plus_batt":
-            L1 = 800.0 if L1 is None else L1
-            PV_AC = 500.0 if self.settings.get("/Settings/Test/PV_AC", None) is None else PV_AC
-            GEN = 0.0
-        elif sc == "day_surplus":
-            L1 = 300.0 if L1 is None else L1
-            PV_AC = 600.0 if self.settings.get("/Settings/Test/PV_AC", None) is None else PV_AC
-            GEN = 0.0
-        elif sc == "gen":
-            L1 = 1600.0 if L1 is None else L1
-            PV_AC = 500.0 if self.settings.get("/Settings/Test/PV_AC", None) is None else PV_AC
-            GEN = 1200.0 if self.settings.get("/Settings/Test/GenPower", None) is None else GEN
-        elif sc == "custom":
-            L1 = 900.0 if L1 is None else L1
-            PV_AC = 620.0 if PV_AC is None else PV_AC
-        elif sc == "off":
-            pass
+    def _scenario_values(self, ts: TestSettings) -> Dict[str, float]:
+        L1, L2, L3, PV_AC, PV_DC, GEN = ts.L1, ts.L2, ts.L3, ts.PV_AC, ts.PV_DC, ts.GEN
+        spec = _SCENARIO_TABLE.get(self.scenario)
+        if spec is not None:
+            l1_def, pv, pv_rule, gen, gen_rule = spec
+            if L1 is None:
+                L1 = l1_def
+            if pv_rule == _FIX or (pv_rule == _IF_UNSET and not ts.PV_AC_SET) or (pv_rule == _IF_NONE and PV_AC is None):
+                PV_AC = pv
+            elif pv_rule == _FROM_L1:
+                PV_AC = L1
+            if gen_rule == _FIX or (gen_rule == _IF_UNSET and not ts.GEN_SET):
+                GEN = gen
 
         return dict(L1=float(L1), L2=float(L2), L3=float(L3), PV_AC=float(PV_AC), PV_DC=float(PV_DC), GEN=float(GEN))
 
-    def step(self, dt: float) -> Dict[str, Any]:
-        v = self._scenario_values()
+    def step(self, dt: float, ts: TestSettings = None) -> Dict[str, Any]:
+        """ts: Settings-Snapshot des Ticks (SettingsStore.snapshot_test); ohne wird er hier gelesen."""
+        if ts is None:
+            ts = TestSettings.from_get(self.settings.get)
+        v = self._scenario_values(ts)
         loads = v["L1"] + v["L2"] + v["L3"]
 
         if self.override:
-            self.voltage = float(self.settings.get("/Settings/Test/Battery/Voltage", self.voltage))
-            self.current = float(self.settings.get("/Settings/Test/Battery/Current", self.current))
-            self.power = float(self.settings.get("/Settings/Test/Battery/Power", self.power))
-            self.soc = float(self.settings.get("/Settings/Test/Battery/Soc", self.soc))
+            if ts.BATT_V is not None: self.voltage = float(ts.BATT_V)
+            if ts.BATT_I is not None: self.current = float(ts.BATT_I)
+            if ts.BATT_P is not None: self.power = float(ts.BATT_P)
+            if ts.BATT_SOC is not None: self.soc = float(ts.BATT_SOC)
         else:
             self._auto_battery(dt=dt, loads_w=loads, pv_ac=v["PV_AC"], pv_dc=v["PV_DC"], gen_w=v["GEN"])
 
         outback_state = STATE_PASSTHROUGH if (self.scenario == "gen" and v["GEN"] > 0.0) else STATE_INVERT
 
-        v["PV_AC"] = compute_pv_ac(v["L1"], self.power)
+        v["PV_AC"] = compute_pv_ac(v["L1"], self.power) if v["L1"] > 0.0 else 0.0
 
         return {
             "L1": v["L1"], "L2": v["L2"], "L3": v["L3"],
@@ -99,4 +93,4 @@ class TestMode:
         }
 
     def read_battery_live_fallback(self):
-        return {"V": self.voltage, "I": self.current, "P": self.power, "SOC": self.soc}
+        return BattSample(self.voltage, self.current, self.power, self.soc)
@@ -12,6 +12,9 @@ try:
 except Exception:
     tinytuya = None
 
+_DP_KEYS = ("5", "19", "20", "21")   # mögliche Leistungs-DPs je Gerätetyp
+_NUM_TYPES = frozenset((int, float))  # exakter Typ (bool zählt nicht als Leistung)
+
 
 class TuyaClient:
     def __init__(self, dev_id: str = "", local_key: str = "", address: Optional[str] = None):
@@ -19,6 +22,7 @@ class TuyaClient:
         self.local_key = local_key
         self.address = address
         self._device = None
+        self._dp_key = None   # zuletzt erfolgreicher DP, wird zuerst geprüft
         if tinytuya and dev_id and local_key:
             try:
                 self._device = tinytuya.OutletDevice(dev_id, address, local_key)
@@ -26,14 +30,23 @@ class TuyaClient:
             except Exception:
                 self._device = None
 
+    @property
+    def blocking(self) -> bool:
+        """True, wenn read_power echtes Netz-I/O macht (dann im Hintergrund pollen)."""
+        return self._device is not None
+
     def read_power(self) -> float:
         if self._device is None:
             return 0.0
         try:
-            data = self._device.status()
-            for key in ("5", "19", "20", "21"):
-                val = data["dps"].get(key)
-                if isinstance(val, (int, float)):
+            dps = self._device.status()["dps"]
+            val = dps.get(self._dp_key) if self._dp_key else None
+            if type(val) in _NUM_TYPES:
+                return float(val)
+            for key in _DP_KEYS:
+                val = dps.get(key)
+                if type(val) in _NUM_TYPES:
+                    self._dp_key = key
                     return float(val)
             return 0.0
         except Exception:
@@ -10,37 +10,60 @@ läuft aber auch lokal im Dry‑Run dank Stubs.
 import argparse
 import json
 import os
+import queue
 import signal
 import sys
 import time
-from datetime import date
+from datetime import date, timedelta
 from typing import Dict, Any
 import subprocess
 import shlex
 import re
+import threading
 
 # Lokale Module
 from modules.loggerx import make_logger, Summary
 from modules.state_machine import (
-    compute_pv_ac, classify_state,
+    compute_pv_ac, classify_state_code, STATE_NAMES,
     STATE_OFF, STATE_INVERT, STATE_CHARGE, STATE_PASSTHROUGH,
-    clamp, EMA
+    EMAVec
 )
 from modules.dbus_helpers import (
     is_real_dbus, VeDbusServiceWrapper, SettingsStore, ensure_data_dir, BatteryDbusReader
 )
 from modules.services import (
-    InverterOutbackService, PVInverterService, GridGeneratorService, AcMeterService
+    InverterOutbackService, PVInverterService, GridGeneratorService, AcMeterService, DB_ENERGY_KWH
 )
 from modules.testmode import TestMode
 from modules.ble_client import BleOutbackClient
 from modules.tuya_client import TuyaClient
 from modules.et112_reader import Et112Reader
+from modules.async_poller import AsyncPoller
+from modules.state_journal import StateJournal
+
+try:
+    # optional: orjson (C, serialisiert direkt nach bytes)
+    import orjson  # type: ignore
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except Exception:
+    orjson = None
+    _json_dumps = lambda o: json.dumps(o, separators=(",", ":")).encode("utf-8")
+    _json_loads = json.loads
+
+try:
+    # Auf Venus OS vorhanden – Mainloop für Timer und D-Bus-Signale
+    from dbus.mainloop.glib import DBusGMainLoop  # type: ignore
+    from gi.repository import GLib  # type: ignore
+except Exception:
+    DBusGMainLoop = None  # Fallback: sleep-Schleife
+    GLib = None
 
 VERSION = "1.0.0"
 
 DATA_DIR = "/data/outback_spc"
 STATE_FILE = os.path.join(DATA_DIR, "state.json")
+STATE_JOURNAL_FILE = STATE_FILE + ".log"   # Forward-Zähler zwischen zwei Snapshots (nicht blueProbes state.wal)
 
 DEFAULT_DEVICE_INSTANCES = dict(inverter=18, pvinverter=28, grid=38, l2=48, l3=58)
 
@@ -50,17 +73,101 @@ RUN = True
 def load_state() -> Dict[str, Any]:
     ensure_data_dir(DATA_DIR)
     try:
-        with open(STATE_FILE, "r") as f:
-            return json.load(f)
+        with open(STATE_FILE, "rb") as f:
+            state = _json_loads(f.read())
     except Exception:
-        return {"pv_forward_kwh": 0.0, "last_reset_ymd": "", "l2_forward_kwh": 0.0, "l3_forward_kwh": 0.0, "settings": {}}
-
-
-def save_state(state: Dict[str, Any]) -> None:
+        state = {"pv_forward_kwh": 0.0, "last_reset_ymd": "", "l2_forward_kwh": 0.0, "l3_forward_kwh": 0.0, "settings": {}}
+    _journal.replay(state)   # Zählerstände nach dem letzten Snapshot nachspielen
+    _journal.open()
+    return state
+
+
+STATE_SAVE_MIN_S = 300.0  # Snapshot höchstens alle 5 min (außer force/urgent); dazwischen trägt das Journal die Zähler
+_last_saved = None        # zuletzt *erfolgreich* geschriebenes JSON (bytes; setzt der Writer)
+_last_saved_t = 0.0
+WH_TO_KWH_PER_S = 1.0 / 3_600_000.0   # W·s → kWh
+V_NOM = 230.0                         # Nennspannung (Schätzwert, keine Messung)
+INV_I_SCALE = 1.0 / V_NOM             # P → I per Multiplikation
+STATE_KWH_EPS = 0.0005    # Zähleränderung, ab der ein Journal-Datensatz geschrieben wird
+STATE_FLUSH_TIMEOUT_S = 2.0   # Beenden: höchstens so lange auf den letzten Schreibvorgang warten
+_SUM_FMT = "L1=%d L2=%d L3=%d | PV_ac=%d PV_dc=%d | GEN=%d | BATT=%d (SOC=%.1f)"   # Summenzeile (Werte gerundet)
+PUBLISH_FORCE_S = 5.0         # unveränderte Werte trotzdem spätestens so oft publizieren (GX-Watchdog sieht /UpdateIndex)
+_KWH_Q = 1.0 / DB_ENERGY_KWH   # Zähler in Dead-Band-Schritten für die Publish-Signatur
+TICK_LOG_RL_MS = int(PUBLISH_FORCE_S * 1000)   # Tick-INFO-Zeilen: gleicher Text höchstens so oft (LoggerX-Ratenlimit)
+_writer_q: "queue.Queue" = queue.Queue()   # (json, Event|None, journal_seq|None)
+_writer = None            # Daemon-Thread, beim ersten Speichern gestartet
+_journal = StateJournal(STATE_JOURNAL_FILE)
+_log_state = make_logger("STATE")   # Writer-Thread (vor main)
+
+
+def _write_state_file(data: bytes) -> None:
+    """Atomar + dauerhaft: tmp schreiben, fsync, rename, Verzeichnis fsyncen (kein leeres state.json nach Stromausfall)."""
     tmp = STATE_FILE + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump(state, f)
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
     os.replace(tmp, STATE_FILE)
+    try:
+        dfd = os.open(DATA_DIR, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+    except OSError:
+        pass   # Dateisystem ohne Verzeichnis-fsync: rename ist trotzdem atomar
+
+
+def _writer_loop() -> None:
+    """Schreibt state.json abseits der Hauptschleife; aufgelaufene Stände werden koalesziert."""
+    while True:
+        data, done, seq = _writer_q.get(); waiters = [done] if done else []
+        while True:   # nur den jüngsten Stand schreiben
+            try:
+                data, done, seq = _writer_q.get_nowait()
+            except queue.Empty:
+                break
+            if done: waiters.append(done)
+        global _last_saved
+        try:
+            _write_state_file(data)
+        except Exception as e:
+            _log_state.error(f"state.json schreiben fehlgeschlagen: {e}")   # _last_saved bleibt → nächster Versuch schreibt erneut
+        else:
+            _last_saved = data
+            if seq is not None:
+                _journal.truncate_upto(seq)   # Snapshot deckt das Journal bis seq ab
+        for ev in waiters:
+            ev.set()
+
+
+def save_state(state: Dict[str, Any], force: bool = False, urgent: bool = False) -> bool:
+    """
+    True = Stand ist an den Writer übergeben (bzw. bereits so geschrieben); False = gedrosselt, oder ein
+    erzwungenes Speichern wurde nicht innerhalb STATE_FLUSH_TIMEOUT_S erfolgreich fertig.
+    urgent: Drossel umgehen, aber nicht warten (z. B. Tageswechsel).
+    """
+    global _last_saved_t, _writer
+    now = time.monotonic()
+    if not (force or urgent) and (now - _last_saved_t) < STATE_SAVE_MIN_S:
+        return False
+    data = _json_dumps(state)
+    if data == _last_saved:   # so bereits auf Disk → kein Schreibzugriff
+        return True
+    if _writer is None:
+        _writer = threading.Thread(target=_writer_loop, name="state-writer", daemon=True)
+        _writer.start()
+    _last_saved_t = now
+    seq = state.get("journal_seq")
+    if not force:
+        _writer_q.put_nowait((data, None, seq))   # Disk-I/O nicht im Takt der Hauptschleife
+        return True
+    # beim Beenden: auf genau diesen Stand warten (Event statt unbegrenztem Queue.join; hängendes eMMC blockiert nicht)
+    done = threading.Event()
+    _writer_q.put_nowait((data, done, seq))
+    return done.wait(STATE_FLUSH_TIMEOUT_S) and _last_saved == data
 
 
 def setup_argparser() -> argparse.ArgumentParser:
@@ -100,6 +207,8 @@ def setup_argparser() -> argparse.ArgumentParser:
     p.add_argument("--hci", default="hci0", help="BLE-Adapter (z. B. hci0)")
     p.add_argument("--bt-interval", type=float, default=1.8, help="Mindest-Rundenintervall s")
     p.add_argument("--bt-backoff-max", type=float, default=15.0, help="Max. Backoff s bei Fehlern")
+    p.add_argument("--bt-timeout", type=float, default=0.0, help="Timeout s je BLE-Runde via SIGALRM (0=aus)")
+    p.add_argument("--bt-notify", action="store_true", help="A03/A11 per GATT-Notify statt Polling (Fallback: Polling)")
 
     # Testmodus
     p.add_argument("--testmode", choices=[
@@ -172,9 +281,18 @@ def _dbus_presence_log(log_core):
         log_core.warning(f"dbus: presence‑check skipped ({e})")
 
 
+_day_iso = ""      # heutiges Datum (ISO), nur zum Tageswechsel neu gebildet
+_day_end = 0.0     # Epoch der nächsten lokalen Mitternacht (DST-korrekt via mktime)
+
+
 def midnight_changed(last_ymd: str) -> (bool, str):
-    now_ymd = date.today().isoformat()
-    return (last_ymd != now_ymd), now_ymd
+    global _day_iso, _day_end
+    now = time.time()
+    if now >= _day_end or _day_end - now > 90000.0:   # Tageswechsel oder Uhr zurückgestellt
+        d = date.fromtimestamp(now)
+        _day_iso = d.isoformat()
+        _day_end = time.mktime((d + timedelta(days=1)).timetuple())
+    return (last_ymd != _day_iso), _day_iso
 
 
 
@@ -183,9 +301,12 @@ def graceful_exit(signum, frame):
     RUN = False
 
 # ──────────────────────────────────────────────────────────────
-# Autodetect-Helfer: bluetoothctl Wrapper + Parser
+# Autodetect-Helfer: BlueZ über D-Bus, bluetoothctl Wrapper + Parser als Fallback
 # ──────────────────────────────────────────────────────────────
 
+_BT_DEV_RE = re.compile(r"^Device\s+([0-9A-F:]{17})\s+(.+)$")   # Zeile aus `bluetoothctl devices`
+
+
 def _btctl(cmd: str, timeout: int = 8) -> str:
     """bluetoothctl-Einzelbefehl ausführen und stdout liefern (robust, mit Timeout)."""
     try:
@@ -201,19 +322,47 @@ def _btctl(cmd: str, timeout: int = 8) -> str:
         return ""
 
 
+def _bluez_devices():
+    """BlueZ-Geräte direkt über D-Bus (ObjectManager, kein Fork) → {MAC: Device1-Properties}; None ohne dbus/BlueZ."""
+    try:
+        import dbus  # nur wenn verfügbar
+        om = dbus.Interface(dbus.SystemBus().get_object("org.bluez", "/"), "org.freedesktop.DBus.ObjectManager")
+        objs = om.GetManagedObjects()
+    except Exception:
+        return None
+    res = {}
+    for ifaces in objs.values():
+        p = ifaces.get("org.bluez.Device1")
+        if p and "Address" in p:
+            res[str(p["Address"]).upper()] = p
+    return res
+
+
 def _bt_list_devices() -> Dict[str, str]:
-    """Parst `bluetoothctl devices` → {MAC: NAME}."""
+    """{MAC: NAME} über BlueZ-D-Bus; Fallback: `bluetoothctl devices` parsen."""
+    devs = _bluez_devices()
+    if devs is not None:
+        return {mac: str(p.get("Alias", p.get("Name", ""))) for mac, p in devs.items()}
     out = _btctl("devices", timeout=5)
     res: Dict[str, str] = {}
     for line in out.splitlines():
-        m = re.match(r"^Device\s+([0-9A-F:]{17})\s+(.+)$", line.strip())
+        m = _BT_DEV_RE.match(line.strip())
         if m:
             res[m.group(1)] = m.group(2).strip()
     return res
 
 
 def _bt_info(mac: str) -> Dict[str, str]:
-    """Parst `bluetoothctl info <MAC>` in ein Dict."""
+    """Geräteinfo als Dict im Format von `bluetoothctl info <MAC>` (BlueZ-D-Bus, Fallback: bluetoothctl)."""
+    devs = _bluez_devices()
+    if devs is not None:
+        p = devs.get(mac.upper())
+        if p is None:
+            return {}
+        yn = lambda k: "yes" if p.get(k) else "no"
+        return {"Name": str(p.get("Name", "")), "Alias": str(p.get("Alias", "")),
+                "Paired": yn("Paired"), "Trusted": yn("Trusted"), "Connected": yn("Connected"),
+                "Address Type": str(p.get("AddressType", "public"))}
     out = _btctl(f"info {mac}", timeout=5)
     info: Dict[str, str] = {}
     for line in out.splitlines():
@@ -318,6 +467,10 @@ def main():
     parser = setup_argparser()
     args = parser.parse_args()
 
+    # Mainloop vor dem ersten SystemBus() setzen, sonst kommen keine Signale an
+    if DBusGMainLoop is not None:
+        DBusGMainLoop(set_as_default=True)
+
     # Signale
     signal.signal(signal.SIGTERM, graceful_exit)
     signal.signal(signal.SIGINT, graceful_exit)
@@ -362,6 +515,10 @@ def main():
     log_gen = make_logger("GEN", settings.get("/Settings/Log/Gen", "INFO"), args.log_format, rl_ms)
     log_et  = make_logger("ET112", settings.get("/Settings/Log/ET112", "INFO"), args.log_format, rl_ms)
     log_tst = make_logger("TEST", settings.get("/Settings/Log/TestMode", "INFO"), args.log_format, rl_ms)
+    # je Tick-Zeile ein eigener Logger: Dedupe vergleicht nur mit der letzten Zeile desselben Loggers
+    log_pv_t   = make_logger("PV", settings.get("/Settings/Log/PV", "INFO"), args.log_format, TICK_LOG_RL_MS)
+    log_inv_t  = make_logger("INV", settings.get("/Settings/Log/Outback", "INFO"), args.log_format, TICK_LOG_RL_MS)
+    log_core_t = make_logger("CORE", settings.get("/Settings/Log/Core", "INFO"), args.log_format, TICK_LOG_RL_MS)
 
     # Dienste – Standard NICHT-DRY; nur wenn --dry-run gesetzt wurde
     dry = bool(args.dry_run)
@@ -420,10 +577,15 @@ def main():
     if mac_resolved:
         os.environ.setdefault("OUTBACK_BLE_MAC", mac_resolved)
 
+    hc = state.get("ble_handles") or {}   # Handle-Cache nur für dieselbe MAC übernehmen
     ble = BleOutbackClient(mac=mac_resolved, hci=args.hci,
                            min_interval_s=args.bt_interval,
                            backoff_max_s=args.bt_backoff_max,
-                           debug=args.debug)
+                           debug=args.debug,
+                           op_timeout_s=args.bt_timeout,
+                           notify=args.bt_notify,
+                           addr_type=addr_resolved,
+                           handles=(hc.get("a03"), hc.get("a11")) if str(hc.get("mac", "")).upper() == (mac_resolved or "").upper() else None)
     src = ("CLI" if mac_cli else ("SETTINGS" if mac_cfg else ("ENV" if mac_env else ("SCAN" if 'autodetect_used' in locals() and autodetect_used and mac_resolved else "AUTO"))))
     try:
         s0 = ble.get_status() if hasattr(ble, "get_status") else {}
@@ -439,13 +601,13 @@ def main():
     tuya = TuyaClient(dev_id=args.tuya_id, local_key=args.tuya_key)
     et_l2 = Et112Reader(source_hint=args.et112_l2)
     et_l3 = Et112Reader(source_hint=args.et112_l3)
+    # blockierende Quellen im Hintergrund pollen; die Hauptschleife liest nur den letzten Wert
+    read_l2, read_l3, read_gen = (
+        AsyncPoller(r.read_power, period=1.0, name=n).start().latest if r.blocking else r.read_power
+        for r, n in ((et_l2, "et112-l2"), (et_l3, "et112-l3"), (tuya, "tuya")))
 
-    # EMA-Glätter
-    ema_p_l1 = EMA(alpha=0.3)
-    ema_p_pv = EMA(alpha=0.3)
-    ema_p_gen = EMA(alpha=0.3)
-    ema_p_l2 = EMA(alpha=0.3)
-    ema_p_l3 = EMA(alpha=0.3)
+    # EMA-Glätter (L1, PV, GEN, L2, L3 gemeinsam)
+    ema_p = EMAVec(alpha=0.3)
 
     # Generator-Hysterese
     gen_thr_on = 200.0  # W Einschalt-Schwelle (Tuya-Leistung)
@@ -467,25 +629,38 @@ def main():
     # Summenlogger
     summary = Summary(period_s=int(settings.get("/Settings/Log/SummaryPeriodSec", 5)))
     # BLE-Status CORE-DEBUG Ticker (~5s)
-    ble_dbg_last = 0.0
-    ble_dbg_period = 5.0
+    ble_dbg_last_ns = 0
+    ble_dbg_period_ns = 5_000_000_000
 
     # Einmal Dump?
     if args.dump_now:
         log_core.info("dump-now: pv_forward_kwh=%.3f l2=%.3f l3=%.3f" % (pv_forward_kwh, l2_forward_kwh, l3_forward_kwh))
 
+    # Publish nur bei geänderter Signatur, spätestens alle PUBLISH_FORCE_S (Zähler/EMA/Logs laufen immer weiter)
+    pub_sig = None
+    pub_last = 0.0
+    # Persistenz: Zähleränderungen ins Journal, state.json nur als gedrosselter Snapshot
+    saved_kwh = (pv_forward_kwh, l2_forward_kwh, l3_forward_kwh)   # zuletzt journalisierter Stand
+    state_dirty = True    # Snapshot fällig; Start: Settings/Autodetect einmal sichern
+    state_urgent = False
+
     # Hauptschleife
     poll_interval = 1.0  # s
-    t_prev = time.monotonic()
-
-    while RUN:
-        t_loop = time.monotonic()
-        dt = max(0.001, t_loop - t_prev)
-        t_prev = t_loop
+    poll_interval_ns = int(poll_interval * 1e9)
+    t_prev_ns = time.monotonic_ns()   # Schleifenzeit ganzzahlig in ns, ein Uhrzugriff je Tick
+
+    def _tick():
+        nonlocal t_prev_ns, gen_running, gen_last_change, pv_forward_kwh, l2_forward_kwh, l3_forward_kwh
+        nonlocal last_reset_ymd, ble_dbg_last_ns, pub_sig, pub_last, saved_kwh, state_dirty, state_urgent
+        t_loop_ns = time.monotonic_ns()
+        dt_ns = t_loop_ns - t_prev_ns
+        dt = dt_ns * 1e-9 if dt_ns > 1_000_000 else 0.001   # mind. 1 ms
+        t_prev_ns = t_loop_ns
+        now = t_loop_ns * 1e-9   # Sekunden (Generator-Hysterese, Publish-Takt)
 
         # === Messwerte beziehen ===
-        if settings.get("/Settings/Devices/OutbackSPC/TestMode", 0):
-            sim = testmode.step(dt)
+        if settings.get("/Settings/Devices/OutbackSPC/TestMode", 0):   # je Tick lesen (Dict-Lookup) – jede Änderung greift im nächsten Tick
+            sim = testmode.step(dt, settings.snapshot_test())
             l1_power = sim["L1"]
             l2_power = sim["L2"]
             l3_power = sim["L3"]
@@ -509,6 +684,10 @@ def main():
                 outback_state = int(snap.get("state", STATE_INVERT))
                 rssi = int(snap.get("rssi", -70))
                 last_ble_update = int(time.time())
+                hc = ble.handles   # bestätigte GATT-Handles für den nächsten Start merken
+                if hc and state.get("ble_handles") != {"mac": ble.mac, "a03": hc[0], "a11": hc[1]}:
+                    state["ble_handles"] = {"mac": ble.mac, "a03": hc[0], "a11": hc[1]}
+                    state_dirty = True
             else:
                 # Ohne BLE: Werte 0, State Invert, alles ruhig
                 l1_power = 0.0
@@ -517,53 +696,47 @@ def main():
                 last_ble_update = 0
 
             # Batterie vom BMV-712 (DC-Wahrheit) via D-Bus bevorzugen; Fallback lokal
-            b_live = batt_reader.read()
-            if b_live is not None:
-                batt_v, batt_i, batt_p, batt_soc = b_live["V"], b_live["I"], b_live["P"], b_live["SOC"]
-            else:
-                b = testmode.read_battery_live_fallback()
-                batt_v, batt_i, batt_p, batt_soc = b["V"], b["I"], b["P"], b["SOC"]
+            b_live = batt_reader.read()   # BattSample (V, I, P, SOC) oder None
+            if b_live is None:
+                b_live = testmode.read_battery_live_fallback()
+            batt_v, batt_i, batt_p, batt_soc = b_live
 
             # L2/L3 von ET112 (optional). Stub = 0.
-            l2_power = et_l2.read_power()
-            l3_power = et_l3.read_power()
+            l2_power = read_l2()
+            l3_power = read_l3()
 
             # Generatorleistung via Tuya (optional)
-            gen_power = tuya.read_power()
-            pv_ac = compute_pv_ac(l1_power, batt_p)
+            gen_power = read_gen()
+            pv_ac = compute_pv_ac(l1_power, batt_p) if l1_power > 0.0 else 0.0   # ohne L1-Last (z. B. kein BLE) trivial 0
             pv_dc = 0.0  # DC-PV ausschließlich externer Victron-MPPT, hier NICHT ableiten!
 
         # === BLE-Status (CORE DEBUG, alle ~5s) ===
-        now_mono = time.monotonic()
-        if (now_mono - ble_dbg_last) >= ble_dbg_period:
-            try:
-                s = ble.get_status() if hasattr(ble, "get_status") else {}
-            except Exception:
-                s = {}
-            stat = s.get("status", "n/a")
-            nxt = s.get("next_in_s", 0.0)
-            okc = s.get("ok", 0)
-            flc = s.get("fail", 0)
-            cfc = s.get("consec_fails", 0)
-            mac = s.get("mac", "?")
-            hci = s.get("hci", "?")
-            backend = s.get("backend", "?")
-            addr_t  = s.get("addr_type", "?")
-            log_core.debug(
-                f"BLE[{stat}] mac={mac} hci={hci} backend={backend}/{addr_t} "
-                f"next={nxt:.1f}s ok={okc} fail={flc} consec={cfc} rssi={rssi}"
-            )
-            ble_dbg_last = now_mono
+        if (t_loop_ns - ble_dbg_last_ns) >= ble_dbg_period_ns:
+            if log_core.enabled("DEBUG"):
+                try:
+                    s = ble.get_status() if hasattr(ble, "get_status") else {}
+                except Exception:
+                    s = {}
+                stat = s.get("status", "n/a")
+                nxt = s.get("next_in_s", 0.0)
+                okc = s.get("ok", 0)
+                flc = s.get("fail", 0)
+                cfc = s.get("consec_fails", 0)
+                mac = s.get("mac", "?")
+                hci = s.get("hci", "?")
+                backend = s.get("backend", "?")
+                addr_t  = s.get("addr_type", "?")
+                log_core.debug(
+                    f"BLE[{stat}] mac={mac} hci={hci} backend={backend}/{addr_t} "
+                    f"next={nxt:.1f}s ok={okc} fail={flc} consec={cfc} rssi={rssi}"
+                )
+            ble_dbg_last_ns = t_loop_ns
 
         # === EMA-Glättung ===
-        l1_power_s = ema_p_l1.update(l1_power)
-        pv_ac_s = ema_p_pv.update(pv_ac)
-        gen_power_s = ema_p_gen.update(gen_power)
-        l2_power_s = ema_p_l2.update(l2_power)
-        l3_power_s = ema_p_l3.update(l3_power)
+        l1_power_s, pv_ac_s, gen_power_s, l2_power_s, l3_power_s = ema_p.update(
+            (l1_power, pv_ac, gen_power, l2_power, l3_power))
 
         # === Generator AND-Logik mit Hysterese + Mindestlaufzeit ===
-        now = time.monotonic()
         if outback_state == STATE_PASSTHROUGH and gen_power_s >= gen_thr_on:
             if not gen_running:
                 gen_running = True
@@ -573,7 +746,7 @@ def main():
             gen_last_change = now
 
         # === Systemzustand bestimmen ===
-        sys_state = classify_state(
+        sys_state = classify_state_code(   # int-Code (SYS_*), Name nur fürs Logging
             pv_ac=pv_ac_s, l1_out=l1_power_s, batt_p=batt_p,
             outback_state=outback_state, gen_power=gen_power_s, eps=50.0
         )
@@ -583,61 +756,77 @@ def main():
         if changed:
             pv_forward_kwh = 0.0
             last_reset_ymd = now_ymd
-        pv_forward_kwh += max(0.0, pv_ac_s) / 3600.0 / 1000.0 * dt
-        l2_forward_kwh += max(0.0, l2_power_s) / 3600.0 / 1000.0 * dt
-        l3_forward_kwh += max(0.0, l3_power_s) / 3600.0 / 1000.0 * dt
+            state_dirty = state_urgent = True   # Tagesreset sofort sichern
+        dt_kwh = dt * WH_TO_KWH_PER_S   # W·s → kWh, einmal je Tick
+        # nur positive Leistung zählt; bedingt statt max() (kein Builtin-Aufruf je Kanal)
+        if pv_ac_s > 0.0:
+            pv_forward_kwh += pv_ac_s * dt_kwh
+        if l2_power_s > 0.0:
+            l2_forward_kwh += l2_power_s * dt_kwh
+        if l3_power_s > 0.0:
+            l3_forward_kwh += l3_power_s * dt_kwh
 
         # === D‑Bus Services aktualisieren ===
-        # Inverter L1
-        inverter.update(
-            voltage=clamp(230.0, 0, 300),  # Schätzwert
-            current=l1_power_s / 230.0 if 230.0 > 0 else 0.0,
-            power=l1_power_s,
-            state=outback_state,
-            last_ble_update=last_ble_update,
-            rssi=rssi
-        )
-        # PV‑Inverter L1
-        pvinv.update(power=pv_ac_s, forward_kwh=pv_forward_kwh)
-
-        # Generator/Grid
-        grid.update(
-            voltage=230.0 if gen_running else 0.0,
-            current=gen_power_s / 230.0 if gen_running else 0.0,
-            power=gen_power_s if gen_running else 0.0,
-            running=1 if gen_running else 0
-        )
-
-        # AC‑Meter L2/L3
-        l2.update(power=l2_power_s, voltage=230.0 if l2_power_s > 0 else 0.0,
-                  current=(l2_power_s / 230.0) if l2_power_s > 0 else 0.0,
-                  forward_kwh=l2_forward_kwh)
-        l3.update(power=l3_power_s, voltage=230.0 if l3_power_s > 0 else 0.0,
-                  current=(l3_power_s / 230.0) if l3_power_s > 0 else 0.0,
-                  forward_kwh=l3_forward_kwh)
-
-        try:
-            # kurze Bestätigung der letzten Publikationen
-            log_core.debug(
-                "dbus pub: PV.L1=%dW fwd=%.3fkWh | INV.L1=%dW V=%.1fA=%.2f state=%d",
-                int(round(pv_ac_s)), pv_forward_kwh, int(round(l1_power_s)), 230.0, (l1_power_s/230.0 if 230.0 else 0.0), int(outback_state)
+        sig = (round(l1_power_s, 1), round(pv_ac_s, 1), round(gen_power_s, 1), round(l2_power_s, 1),
+               round(l3_power_s, 1), outback_state, rssi, gen_running, round(batt_p), sys_state,
+               int(pv_forward_kwh * _KWH_Q), int(l2_forward_kwh * _KWH_Q), int(l3_forward_kwh * _KWH_Q))
+        if sig != pub_sig or (now - pub_last) >= PUBLISH_FORCE_S:
+            pub_sig = sig; pub_last = now
+            # Inverter L1
+            inverter.update(
+                voltage=V_NOM,  # Schätzwert
+                current=l1_power_s * INV_I_SCALE,
+                power=l1_power_s,
+                state=outback_state,
+                last_ble_update=last_ble_update,
+                rssi=rssi
+            )
+            # PV‑Inverter L1
+            pvinv.update(power=pv_ac_s, forward_kwh=pv_forward_kwh)
+
+            # Generator/Grid
+            grid.update(
+                voltage=V_NOM if gen_running else 0.0,
+                current=gen_power_s * INV_I_SCALE if gen_running else 0.0,
+                power=gen_power_s if gen_running else 0.0,
+                running=1 if gen_running else 0
             )
-            # UpdateIndex anzeigen (falls verfügbar)
-            try:
-                ui_pv  = pvinv.svc.get("/UpdateIndex", None)
-                ui_inv = inverter.svc.get("/UpdateIndex", None)
-                log_core.debug(f"dbus idx: pv={ui_pv} inv={ui_inv}")
-            except Exception:
-                pass
-        except Exception:
-            pass
+
+            # AC‑Meter L2/L3
+            l2.update(power=l2_power_s, voltage=V_NOM if l2_power_s > 0 else 0.0,
+                      current=(l2_power_s * INV_I_SCALE) if l2_power_s > 0 else 0.0,
+                      forward_kwh=l2_forward_kwh)
+            l3.update(power=l3_power_s, voltage=V_NOM if l3_power_s > 0 else 0.0,
+                      current=(l3_power_s * INV_I_SCALE) if l3_power_s > 0 else 0.0,
+                      forward_kwh=l3_forward_kwh)
+
+            if log_core.enabled("DEBUG"):
+                # kurze Bestätigung der letzten Publikationen
+                log_core.debug(
+                    "dbus pub: PV.L1=%dW fwd=%.3fkWh | INV.L1=%dW V=%.1fA=%.2f state=%d" % (
+                        round(pv_ac_s), pv_forward_kwh, round(l1_power_s), V_NOM, l1_power_s * INV_I_SCALE, int(outback_state))
+                )
+                # UpdateIndex anzeigen (falls verfügbar)
+                try:
+                    ui_pv  = pvinv.svc.get("/UpdateIndex", None)
+                    ui_inv = inverter.svc.get("/UpdateIndex", None)
+                    log_core.debug(f"dbus idx: pv={ui_pv} inv={ui_inv}")
+                except Exception:
+                    pass
 
         # === Logging (kurz & knapp) ===
-        log_pv.info(f"l1_pv={int(round(pv_ac_s))}W → pvinverter:/Ac/L1/Power")
-        log_inv.info(f"l1_out={int(round(l1_power_s))}W | batt={int(round(batt_p))}W | state={outback_state}")
-        log_core.info(f"state: {sys_state} (pv={int(round(pv_ac_s))} l1={int(round(l1_power_s))} batt={int(round(batt_p))})")
-        log_pv.debug(f"calc: p_pv_ac=clamp({int(round(l1_power))}-max(0,{int(round(-batt_p))}),0,{int(round(l1_power))})={int(round(pv_ac))}W")
-        if args.balance_check:
+        # unabhängig vom Publish-Gate; gleiche Zeilen dämpft das Ratenlimit der Tick-Logger (TICK_LOG_RL_MS).
+        # Texte nur bauen, wenn das Level sie ausgibt
+        # (round(x) liefert schon int – kein int() drumherum)
+        if log_pv_t.enabled("INFO"):
+            log_pv_t.info(f"l1_pv={round(pv_ac_s)}W → pvinverter:/Ac/L1/Power")
+        if log_inv_t.enabled("INFO"):
+            log_inv_t.info(f"l1_out={round(l1_power_s)}W | batt={round(batt_p)}W | state={outback_state}")
+        if log_core_t.enabled("INFO"):
+            log_core_t.info(f"state: {STATE_NAMES[sys_state]} (pv={round(pv_ac_s)} l1={round(l1_power_s)} batt={round(batt_p)})")
+        if log_pv.enabled("DEBUG"):
+            log_pv.debug(f"calc: p_pv_ac=clamp({round(l1_power)}-max(0,{round(-batt_p)}),0,{round(l1_power)})={round(pv_ac)}W")
+        if args.balance_check and log_core.enabled("DEBUG"):
             loads = l1_power_s + l2_power_s + l3_power_s
             sources = pv_ac_s + pv_dc + (gen_power_s if gen_running else 0.0) + max(0.0, -batt_p)
             diff = loads - sources
@@ -645,26 +834,55 @@ def main():
 
         # Summenzeile
         if summary.due():
-            summary.emit(
-                f"L1={int(round(l1_power_s))} L2={int(round(l2_power_s))} L3={int(round(l3_power_s))} | "
-                f"PV_ac={int(round(pv_ac_s))} PV_dc={int(round(pv_dc))} | GEN={int(round(gen_power_s if gen_running else 0.0))} | "
-                f"BATT={int(round(batt_p))} (SOC={round(batt_soc,1)})"
-            )
-
-        # Persistenz sichern
-        state["pv_forward_kwh"] = pv_forward_kwh
-        state["l2_forward_kwh"] = l2_forward_kwh
-        state["l3_forward_kwh"] = l3_forward_kwh
-        state["last_reset_ymd"] = last_reset_ymd
-        save_state(state)
-
-        if args.once:
-            break
-        # 1‑Sekunden‑Takt
-        t_sleep = poll_interval - (time.monotonic() - t_loop)
-        if t_sleep > 0:
-            time.sleep(t_sleep)
+            summary.emit(_SUM_FMT % (
+                round(l1_power_s), round(l2_power_s), round(l3_power_s), round(pv_ac_s), round(pv_dc),
+                round(gen_power_s) if gen_running else 0, round(batt_p), batt_soc))
+
+        # Persistenz: merkliche Zähleränderung → ein Journal-Datensatz; Snapshot gedrosselt über save_state
+        kwh = (pv_forward_kwh, l2_forward_kwh, l3_forward_kwh)
+        if state_urgent or max(abs(a - b) for a, b in zip(kwh, saved_kwh)) >= STATE_KWH_EPS:
+            state["pv_forward_kwh"] = pv_forward_kwh
+            state["l2_forward_kwh"] = l2_forward_kwh
+            state["l3_forward_kwh"] = l3_forward_kwh
+            state["last_reset_ymd"] = last_reset_ymd
+            state["journal_seq"] = _journal.append(pv_forward_kwh, l2_forward_kwh, l3_forward_kwh, last_reset_ymd)
+            saved_kwh = kwh; state_dirty = True
+        if state_dirty and save_state(state, urgent=state_urgent):
+            state_dirty = state_urgent = False
+
+    if GLib is not None and not args.once:
+        # Ereignisgesteuert: ein 1‑Sekunden‑Timer, dazwischen schläft der Prozess in der Mainloop
+        loop = GLib.MainLoop()
+
+        def _on_tick():
+            if RUN:
+                _tick()
+            if not RUN:
+                loop.quit()
+                return False
+            return True
 
+        GLib.timeout_add(int(poll_interval * 1000), _on_tick)
+        loop.run()
+    else:
+        while RUN:
+            t_loop_ns = time.monotonic_ns()
+            _tick()
+            if args.once:
+                break
+            # 1‑Sekunden‑Takt
+            sleep_ns = poll_interval_ns - (time.monotonic_ns() - t_loop_ns)
+            if sleep_ns > 0:
+                time.sleep(sleep_ns * 1e-9)
+
+    state["pv_forward_kwh"] = pv_forward_kwh
+    state["l2_forward_kwh"] = l2_forward_kwh
+    state["l3_forward_kwh"] = l3_forward_kwh
+    state["last_reset_ymd"] = last_reset_ymd
+    state["journal_seq"] = _journal.seq   # Snapshot ist neuer als alle Journal-Datensätze
+    if not save_state(state, force=True):   # letzter Stand beim Beenden
+        log_core.warning("state.json: letzter Schreibvorgang nicht rechtzeitig abgeschlossen")
+    _journal.close()
     log_core.info("Beendet.")
 
 
@@ -9,7 +9,80 @@ BASE = os.path.dirname(os.path.dirname(__file__))
 MODROOT = os.path.join(BASE, "stockFiles", "common", "data", "outback_spc")
 sys.path.insert(0, MODROOT)
 
-from modules.state_machine import compute_pv_ac, classify_state, STATE_PASSTHROUGH
+from modules.state_machine import compute_pv_ac, classify_state, STATE_PASSTHROUGH, EMA, EMAVec
+from modules.ble_client import _A03_UNPACK, _A11_UNPACK
+from modules.state_journal import StateJournal
+import struct
+import tempfile
+import json
+from modules.dbus_helpers import VeDbusServiceWrapper
+try:
+    import blueProbe   # braucht dbus/gi/velib (Venus OS) – sonst wird Case9 übersprungen
+except ImportError as e:
+    blueProbe = None; _BP_ERR = e
+
+def _v3_swap_decode(buf):
+    # Referenz aus v3: BE-signed lesen, dann Bytes tauschen
+    shorts = struct.unpack('>' + 'h' * (len(buf)//2), buf)
+    return tuple(((v >> 8) & 255) | ((v & 255) << 8) for v in shorts)
+
+class _CtxSvc:
+    """velib-Attrappe: Service mit ServiceContext; zählt ItemsChanged (eins je with-Block) und Schreibzugriffe."""
+    def __init__(self):
+        self.paths = {}; self.signals = 0; self.writes = []
+
+    def add_path(self, path, value=None, **_kw): self.paths[path] = value
+    def register(self): pass
+    def __getitem__(self, path): return self.paths[path]
+    def __setitem__(self, path, value): self.paths[path] = value; self.signals += 1; self.writes.append(path)
+    def __enter__(self):
+        svc = self
+
+        class _Ctx:
+            def __setitem__(self, path, value): svc.paths[path] = value; svc.writes.append(path)
+        return _Ctx()
+
+    def __exit__(self, *_exc): self.signals += 1
+
+
+def _set_many_case() -> bool:
+    w = VeDbusServiceWrapper("com.victronenergy.test", dry=True, register=False)
+    svc = _CtxSvc(); w._svc = svc; del w.set, w.get   # Stub-Bindung lösen → velib-Pfad über ServiceContext
+    for p in ("/Ac/Power", "/Ac/Energy/Forward", "/UpdateIndex"):
+        w.add(p, 0)
+    w._deadband["/Ac/Power"] = 1.0
+    ok = w.set_many({"/Ac/Power": 100.0, "/Ac/Energy/Forward": 2.5}, bump_index=True)
+    ok &= svc.signals == 1 and svc.writes.count("/UpdateIndex") == 1 and svc.paths["/UpdateIndex"] == 1
+    # Änderung im Totband (0.4 W < 1.0 W) → nichts geschrieben, kein Signal, kein Index-Bump
+    del svc.writes[:]
+    ok &= not w.set_many({"/Ac/Power": 100.4, "/Ac/Energy/Forward": 2.5}, bump_index=True)
+    ok &= svc.writes == [] and svc.paths["/Ac/Power"] == 100.0 and svc.paths["/UpdateIndex"] == 1
+    # außerhalb des Totbands → genau ein Bump im selben Batch
+    ok &= w.set_many({"/Ac/Power": 102.0, "/Ac/Energy/Forward": 2.5}, bump_index=True)
+    return ok and svc.writes == ["/Ac/Power", "/UpdateIndex"] and svc.paths["/UpdateIndex"] == 2 and svc.signals == 3
+
+
+def _wal_case() -> bool:
+    d = tempfile.mkdtemp(); path = os.path.join(d, "state.json"); wal = os.path.join(d, "state.wal")
+    today = blueProbe.now_local_date_str()
+    with open(path, "w") as f:
+        json.dump({"pv_forward_total_kwh": 1.0, "pv_forward_day_kwh": 0.5, "pv_forward_day_date": today, "wal_seq": 2}, f)
+    good = "1,100,9.0\n3,100,0.25\nkaputt\n4,D,%s\n5,100,0.125\n" % today
+    with open(wal, "w") as f:
+        f.write(good + "6,100,0.5")   # angerissene letzte Zeile (Stromausfall)
+    # Replay: seq <= wal_seq übersprungen, kaputte Zeile ignoriert, Tagesmarker setzt day zurück, Tail verworfen
+    s = blueProbe.PvForwardStore(path)
+    ok = (s.total_kwh, s.day_kwh, s.day_date, s._seq) == (1.375, 0.125, today, 5) and os.path.getsize(wal) == len(good)
+    s.integrate(3600.0, 1.0)   # 1 Wh → neue Zeile hängt sauber hinter der letzten vollständigen
+    with open(wal) as f:
+        ok &= f.read().splitlines()[-1].startswith("6,") and s._seq == 6
+    s.close()   # ohne Worker synchron kompaktieren: state.json übernimmt den Stand, WAL leer
+    with open(path) as f:
+        st = json.load(f)
+    ok &= st["wal_seq"] == 6 and abs(st["pv_forward_total_kwh"] - 1.376) < 1e-9 and os.path.getsize(wal) == 0
+    s = blueProbe.PvForwardStore(path); s.close()
+    return ok and abs(s.total_kwh - 1.376) < 1e-9 and abs(s.day_kwh - 0.126) < 1e-9
+
 
 def test_cases():
     results = []
@@ -25,9 +98,39 @@ def test_cases():
     # 5
     st = classify_state(500, 1600, -100, STATE_PASSTHROUGH, 1200)
     results.append(("Case5", st == "GEN_PASSTHROUGH"))
+    # 6 gezielte Feld-Dekodierung == v3-Volldekodierung an den genutzten Indizes
+    a03 = bytes((i * 37 + 200) & 255 for i in range(20)); a11 = bytes((i * 91 + 7) & 255 for i in range(16))
+    r03 = _v3_swap_decode(a03); r11 = _v3_swap_decode(a11)
+    results.append(("Case6", _A03_UNPACK(a03) == tuple(r03[i] for i in (2, 3, 5, 8, 9))
+                    and _A11_UNPACK(a11) == (r11[6], r11[7])))
+    # 7 EMAVec == fünf Einzel-EMAs (bitgleich)
+    singles = [EMA(alpha=0.3) for _ in range(5)]; vec = EMAVec(alpha=0.3); ok7 = True
+    for k in range(20):
+        xs = [(k * 131 + j * 17) % 900 - 100.5 for j in range(5)]
+        ok7 &= vec.update(xs) == tuple(e.update(x) for e, x in zip(singles, xs))
+    results.append(("Case7", ok7))
+    # 8 Journal: torn tail (Stromausfall) → Neustart → weitere Datensätze bleiben lesbar
+    path = os.path.join(tempfile.mkdtemp(), "state.json.log")
+    j = StateJournal(path); j.replay({}); j.open()
+    for k in range(3):
+        j.append(1.0 + k, 2.0 + k, 3.0 + k, "2026-10-14")
+    j.close()
+    with open(path, "ab") as f:
+        f.write(b"\x07" * 20)
+    st = {}; j = StateJournal(path); ok8 = j.replay(st) and st["pv_forward_kwh"] == 3.0; j.open()
+    for k in range(3):
+        j.append(10.0 + k, 20.0 + k, 30.0 + k, "2026-10-15")
+    j.close()
+    st = {}; ok8 &= StateJournal(path).replay(st)
+    results.append(("Case8", ok8 and (st["pv_forward_kwh"], st["l2_forward_kwh"], st["l3_forward_kwh"],
+                                      st["last_reset_ymd"]) == (12.0, 22.0, 32.0, "2026-10-15")))
+    # 9 PV-WAL (blueProbe): Replay mit kaputter Zeile/torn tail, Tagesmarker, Kompaktierung
+    results.append(("Case9", _wal_case() if blueProbe is not None else None))   # None = übersprungen
+    # 10 set_many: ein ItemsChanged und genau ein /UpdateIndex-Bump je Batch, Totband-Werte übersprungen
+    results.append(("Case10", _set_many_case()))
 
     for name, ok in results:
-        print(name, "PASS" if ok else "FAIL")
+        print(name, "SKIP (%s)" % _BP_ERR if ok is None else "PASS" if ok else "FAIL")
 
 if __name__ == "__main__":
     test_cases()